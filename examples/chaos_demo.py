@@ -7,7 +7,7 @@ import multiprocessing
 from pspf import Stream
 from pspf.state.backends.sqlite_store import SQLiteStateStore
 from pspf.utils.logging import get_logger
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 # Ensure we can import pspf even if not installed
 sys.path.insert(0, os.getcwd())
@@ -18,10 +18,34 @@ logger = get_logger("ChaosDemo")
 STREAM_KEY = f"chaos-demo-stream-{int(time.time())}"
 GROUP_NAME = "chaos-demo-group"
 TOTAL_MESSAGES = 200 # Quicker demo
+DRAIN_TIMEOUT = 30.0 # Seconds to wait for the group to catch up at the end
+# Idle time after which the final worker claims entries left pending by killed
+# workers. Must be well below DRAIN_TIMEOUT so they can be recovered in time.
+FINAL_MIN_IDLE_MS = 5000
 
-async def worker_process(node_id: str, duration: int):
+async def count_processed(state) -> None:
+    count = await state.get("processed_count", 0)
+    await state.put("processed_count", count + 1)
+
+async def reclaim_abandoned(stream: Stream, state, min_idle_time_ms: int) -> None:
+    """
+    Keep claiming entries that killed workers received but never acked,
+    process them, and ack them. Workers only recover stuck entries once at
+    startup (idle > 60s), which is too late for this demo.
+    """
+    while True:
+        claimed = await stream.backend.claim_stuck_messages(min_idle_time_ms=min_idle_time_ms, count=50)
+        if claimed:
+            for _ in claimed:
+                await count_processed(state)
+            await stream.backend.ack_batch([msg_id for msg_id, _ in claimed])
+            logger.info(f"Recovered {len(claimed)} abandoned messages.")
+        await asyncio.sleep(1)
+
+async def worker_process(node_id: str, duration: int, min_idle_time_ms: Optional[int] = None):
     """
     Worker process that runs for a random duration or until stopped.
+    With min_idle_time_ms, it also reclaims entries abandoned by other workers.
     """
     logger.info(f"Worker {node_id} started.")
     
@@ -41,33 +65,52 @@ async def worker_process(node_id: str, duration: int):
     # Handler: Count total messages processed in state
     @stream.subscribe(STREAM_KEY)
     async def handler(msg_id: str, data: Dict[str, Any], ctx) -> None:
-        count = await ctx.state.get("processed_count", 0)
-        await ctx.state.put("processed_count", count + 1)
+        await count_processed(ctx.state)
         # Simulate work
         await asyncio.sleep(random.uniform(0.001, 0.01))
 
     logger.info(f"Worker {node_id} running loop for {duration}s.")
     async with stream:
+        reclaimer = None
+        if min_idle_time_ms is not None:
+            reclaimer = asyncio.create_task(reclaim_abandoned(stream, store, min_idle_time_ms))
         try:
             await asyncio.wait_for(stream.run_forever(), timeout=duration)
         except asyncio.TimeoutError:
             logger.info(f"Worker {node_id} finished duration.")
         except asyncio.CancelledError:
             logger.info(f"Worker {node_id} cancelled.")
+        finally:
+            if reclaimer:
+                reclaimer.cancel()
 
-def run_worker(node_id, duration):
-    asyncio.run(worker_process(node_id, duration))
+def run_worker(node_id, duration, min_idle_time_ms=None):
+    asyncio.run(worker_process(node_id, duration, min_idle_time_ms))
 
-async def producer_process():
-    # Use Stream to emit events
-    stream = Stream(topic=STREAM_KEY, group="producer-group")
-    async with stream:
-        logger.info(f"Producing {TOTAL_MESSAGES} messages...")
-        for i in range(TOTAL_MESSAGES):
-            await stream.emit({"seq": i, "data": "x" * 100})
-            if i % 100 == 0:
-                await asyncio.sleep(0.1)
-        logger.info("Producer done.")
+async def producer_process(stream: Stream):
+    # Emit through the controller's stream, reusing its connection
+    logger.info(f"Producing {TOTAL_MESSAGES} messages...")
+    # Publish in batches of 100: one pipelined round trip per batch
+    for start in range(0, TOTAL_MESSAGES, 100):
+        end = min(start + 100, TOTAL_MESSAGES)
+        await stream.emit_batch([{"seq": i, "data": "x" * 100} for i in range(start, end)])
+        await asyncio.sleep(0.1)
+    logger.info("Producer done.")
+
+def is_drained(info: Dict[str, Any]) -> bool:
+    return info["lag"] == 0 and info["pending"] == 0
+
+async def wait_drained(backend, timeout: float = 30.0, interval: float = 0.25) -> Dict[str, Any]:
+    """
+    Poll the consumer group until nothing is left to deliver (lag) or to ack
+    (pending), or the timeout expires. Returns the last pending info seen.
+    """
+    deadline = time.monotonic() + timeout
+    while True:
+        info = await backend.get_pending_info()
+        if is_drained(info) or time.monotonic() >= deadline:
+            return info
+        await asyncio.sleep(interval)
 
 import argparse
 
@@ -83,54 +126,58 @@ async def main():
     # Setup
     os.makedirs("data/chaos_state", exist_ok=True)
     
-    # Start Producer
-    prod_task = asyncio.create_task(producer_process())
-    
-    # Chaos Controller
-    workers = []
-    start_time = time.time()
-    logger.info(f"Starting chaos controller for {args.duration}s...")
-    
-    while time.time() - start_time < args.duration:
-        # Spawn a worker
-        node_id = f"n{int(time.time()*1000)}"
-        worker_duration = random.randint(3, 6)
-        p = multiprocessing.Process(target=run_worker, args=(node_id, worker_duration))
-        p.start()
-        workers.append(p)
-        logger.info(f"Spawned worker {node_id} (pid {p.pid})")
-        
-        # Kill random worker
-        if len(workers) > 2:
-            victim = random.choice(workers)
-            if victim.is_alive():
-                logger.warning(f"Killing worker pid {victim.pid}")
-                victim.terminate() # SIGTERM
-                victim.join()
-                workers.remove(victim)
+    # One controller stream, on the workers' group, is used both to produce
+    # and to verify lag at the end, so the demo opens a single connection.
+    control = Stream(topic=STREAM_KEY, group=GROUP_NAME)
+    async with control:
+        # Start Producer
+        prod_task = asyncio.create_task(producer_process(control))
         
-        await asyncio.sleep(2)
+        # Chaos Controller
+        workers = []
+        start_time = time.time()
+        logger.info(f"Starting chaos controller for {args.duration}s...")
         
-    await prod_task
-    
-    # Cleanup workers
-    for p in workers:
-        if p.is_alive():
-            p.terminate()
-            p.join()
+        while time.time() - start_time < args.duration:
+            # Spawn a worker
+            node_id = f"n{int(time.time()*1000)}"
+            worker_duration = random.randint(3, 6)
+            p = multiprocessing.Process(target=run_worker, args=(node_id, worker_duration))
+            p.start()
+            workers.append(p)
+            logger.info(f"Spawned worker {node_id} (pid {p.pid})")
             
-    # Wait for final stability
-    await asyncio.sleep(2)
+            # Kill random worker
+            if len(workers) > 2:
+                victim = random.choice(workers)
+                if victim.is_alive():
+                    logger.warning(f"Killing worker pid {victim.pid}")
+                    victim.terminate() # SIGTERM
+                    victim.join()
+                    workers.remove(victim)
             
-    # Verify Data
-    logger.info("Starting final recovery worker to verify lag...")
-    # Using a dummy stream to check lag
-    stream = Stream(topic=STREAM_KEY, group=GROUP_NAME)
-    async with stream:
-        info = await stream.backend.get_pending_info()
+            await asyncio.sleep(2)
+            
+        await prod_task
+        
+        # Chaos is over: start one last worker that outlives the drain timeout and
+        # reclaims what killed workers left pending, so the group can fully drain
+        p = multiprocessing.Process(target=run_worker, args=("n-final", int(DRAIN_TIMEOUT) + 5, FINAL_MIN_IDLE_MS))
+        p.start()
+        workers.append(p)
+        
+        # Verify Data: poll until the group has caught up, rather than a fixed settle time
+        logger.info("Checking final consumer group lag...")
+        info = await wait_drained(control.backend, timeout=DRAIN_TIMEOUT)
         logger.info(f"Final Status: {info}")
         
-        if info["lag"] == 0:
+        # Cleanup workers only once draining is done
+        for p in workers:
+            if p.is_alive():
+                p.terminate()
+                p.join()
+        
+        if is_drained(info):
             logger.info("✅ SUCCESS: All messages rebalanced and processed.")
         else:
             logger.error("❌ FAILURE: Messages lost or stuck.")
@@ -1,15 +1,23 @@
+from contextlib import aclosing
 from typing import Dict, Any, TYPE_CHECKING
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from pspf.utils.logging import get_logger
 from pspf.models import StreamRecord
 import zlib
 import httpx
+import msgpack # type: ignore
 
 if TYPE_CHECKING:
     from pspf.processor import BatchProcessor
 
 logger = get_logger("ClusterAPI")
 
+async def _decode_body(request: Request) -> Any:
+    """Decode a replication body sent as MessagePack or JSON."""
+    if request.headers.get("content-type", "").startswith("application/msgpack"):
+        return msgpack.unpackb(await request.body())
+    return await request.json()
+
 def create_api_app(processor: "BatchProcessor") -> FastAPI:
     """
     Creates the FastAPI Cluster Application for inter-node RPC and health checks.
@@ -48,20 +56,21 @@ def create_api_app(processor: "BatchProcessor") -> FastAPI:
                     leader = await coordinator.get_leader_node(target_p_str)
                     if leader:
                         url = f"http://{leader['host']}:{leader['port']}/state/{key}"
-                        async with httpx.AsyncClient(timeout=2.0) as client:
-                            try:
-                                resp = await client.get(url)
-                                if resp.status_code == 200:
-                                    data = resp.json()
-                                    data["_metadata"] = {"proxied": True, "leader_id": leader["id"]}
-                                    return data
-                                elif resp.status_code == 404:
-                                    raise HTTPException(status_code=404, detail=f"Key {key} not found on leader")
-                                else:
-                                    raise HTTPException(status_code=502, detail=f"Leader error: {resp.text}")
-                            except httpx.RequestError as e:
-                                logger.error(f"Failed to proxy query to {url}: {e}")
-                                raise HTTPException(status_code=503, detail="State leader unreachable")
+                        # Reuse the replication client's connection pool instead of a new client per query
+                        client = log._http_client
+                        try:
+                            resp = await client.get(url, timeout=2.0)
+                            if resp.status_code == 200:
+                                data = resp.json()
+                                data["_metadata"] = {"proxied": True, "leader_id": leader["id"]}
+                                return data
+                            elif resp.status_code == 404:
+                                raise HTTPException(status_code=404, detail=f"Key {key} not found on leader")
+                            else:
+                                raise HTTPException(status_code=502, detail=f"Leader error: {resp.text}")
+                        except httpx.RequestError as e:
+                            logger.error(f"Failed to proxy query to {url}: {e}")
+                            raise HTTPException(status_code=503, detail="State leader unreachable")
                     else:
                         # Fallback: Partition might be in transition, try local just in case
                         logger.warning(f"No leader for partition {target_p_str}, querying local as fallback")
@@ -105,13 +114,15 @@ def create_api_app(processor: "BatchProcessor") -> FastAPI:
         return status
 
     @app.post("/internal/replicate")
-    async def replicate_record(record: StreamRecord) -> Dict[str, str]:
+    async def replicate_record(request: Request) -> Dict[str, str]:
         """
         Internal endpoint for receiving replicated records from the leader.
+        Accepts MessagePack (preferred) or JSON bodies.
         """
         try:
             # We assume the processor has 'replicated_log' attached if HA is enabled
             if hasattr(processor, "replicated_log") and processor.replicated_log:
+                 record = StreamRecord.from_wire(await _decode_body(request))
                  await processor.replicated_log.append_follower(record)
                  return {"status": "acked"}
             else:
@@ -120,6 +131,22 @@ def create_api_app(processor: "BatchProcessor") -> FastAPI:
             logger.error(f"Replication failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
 
+    @app.post("/internal/replicate_batch")
+    async def replicate_batch(request: Request) -> Dict[str, Any]:
+        """
+        Internal endpoint for receiving a batch of replicated records from the leader.
+        """
+        try:
+            if hasattr(processor, "replicated_log") and processor.replicated_log:
+                 records = [StreamRecord.from_wire(r) for r in await _decode_body(request)]
+                 await processor.replicated_log.append_follower_batch(records)
+                 return {"status": "acked", "count": len(records)}
+            else:
+                 raise HTTPException(status_code=501, detail="Replication not enabled on this node")
+        except Exception as e:
+            logger.error(f"Batch replication failed: {e}")
+            raise HTTPException(status_code=500, detail=str(e))
+
     @app.get("/internal/pull/{partition}")
     async def pull_records(partition: int, offset: int = 0) -> list[Dict[str, Any]]:
         """
@@ -128,11 +155,13 @@ def create_api_app(processor: "BatchProcessor") -> FastAPI:
         try:
             if hasattr(processor, "replicated_log") and processor.replicated_log:
                 records = []
-                # Read up to 100 records
-                async for r in processor.replicated_log._local.read(partition, offset):
-                    records.append(r.model_dump(mode='json'))
-                    if len(records) >= 100:
-                        break
+                # Read up to 100 records. Closing the reader right away parks its
+                # cursor at the offset the follower will ask for next.
+                async with aclosing(processor.replicated_log._local.read(partition, offset)) as reader:
+                    async for r in reader:
+                        records.append(r.to_wire())
+                        if len(records) >= 100:
+                            break
                 return records
             else:
                  raise HTTPException(status_code=501, detail="Replication not enabled on this node")
@@ -9,6 +9,29 @@ import valkey.asyncio as valkey
 
 logger = get_logger("ClusterCoordinator")
 
+# Extend a partition lease only if we still own it
+RENEW_LEASE_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("expire", KEYS[1], 10)
+else
+    return 0
+end
+"""
+
+# Take a free partition lease, or refresh it if we already own it.
+# Returns 1 if newly acquired, 2 if already ours, 0 if owned by another node.
+ACQUIRE_LEASE_SCRIPT = """
+local owner = redis.call("get", KEYS[1])
+if not owner then
+    redis.call("set", KEYS[1], ARGV[1], "EX", 10)
+    return 1
+elseif owner == ARGV[1] then
+    redis.call("expire", KEYS[1], 10)
+    return 2
+end
+return 0
+"""
+
 class ValkeyClusterCoordinator(IClusterCoordinator):
     """
     Valkey implementation of ClusterCoordinator.
@@ -25,6 +48,8 @@ class ValkeyClusterCoordinator(IClusterCoordinator):
         self._running = False
         self._client: Optional[valkey.Redis] = None
         self._held_partitions: List[str] = []
+        self._renew_script: Optional[Any] = None
+        self._acquire_script: Optional[Any] = None
         
     @property
     def node_id(self) -> str:
@@ -69,20 +94,7 @@ class ValkeyClusterCoordinator(IClusterCoordinator):
                 await self._register()
                 
                 # 2. Refresh Leases for held partitions
-                for p_key in self._held_partitions:
-                    # Extend TTL only if we are still the owner
-                    key = f"pspf:partition:{p_key}:leader"
-                    script = """
-                    if redis.call("get", KEYS[1]) == ARGV[1] then
-                        return redis.call("expire", KEYS[1], 10)
-                    else
-                        return 0
-                    end
-                    """
-                    result = await self._client.eval(script, 1, key, self.node_id) # type: ignore
-                    if not result:
-                        logger.warning(f"Lost leadership for {p_key}")
-                        self._held_partitions.remove(p_key)
+                await self._renew_leases()
                         
                 # 3. Simple Rebalancing Check
                 try:
@@ -123,6 +135,26 @@ class ValkeyClusterCoordinator(IClusterCoordinator):
             
             await asyncio.sleep(3) # Refresh every 3s (well within 10s TTL)
 
+    async def _renew_leases(self) -> None:
+        """
+        Extends the TTL of every held partition lease in a single round trip.
+        The renewal script is loaded once and invoked via EVALSHA.
+        """
+        if not self._client or not self._held_partitions: return
+        if self._renew_script is None:
+            self._renew_script = self._client.register_script(RENEW_LEASE_SCRIPT)
+
+        held = list(self._held_partitions)
+        async with self._client.pipeline(transaction=False) as pipe:
+            for p_key in held:
+                await self._renew_script(keys=[f"pspf:partition:{p_key}:leader"], args=[self.node_id], client=pipe)
+            results = await pipe.execute()
+        
+        for p_key, result in zip(held, results):
+            if not result and p_key in self._held_partitions:
+                logger.warning(f"Lost leadership for {p_key}")
+                self._held_partitions.remove(p_key)
+
     async def try_acquire_leadership(self, partition_key: str) -> bool:
         """
         Attempts to become the leader for a partition.
@@ -131,24 +163,20 @@ class ValkeyClusterCoordinator(IClusterCoordinator):
         if not self._client: return False
         
         key = f"pspf:partition:{partition_key}:leader"
+        if self._acquire_script is None:
+            self._acquire_script = self._client.register_script(ACQUIRE_LEASE_SCRIPT)
         
-        # Try SET NX EX 10
-        acquired = await self._client.set(key, self.node_id, nx=True, ex=10)
+        # Single round trip: SET NX, or refresh the TTL if WE are already the owner
+        # (maybe registered from before restart or same session)
+        result = await self._acquire_script(keys=[key], args=[self.node_id])
+        if not result:
+            return False
         
-        if acquired:
-            if partition_key not in self._held_partitions:
-                self._held_partitions.append(partition_key)
+        if partition_key not in self._held_partitions:
+            self._held_partitions.append(partition_key)
+        if result == 1:
             logger.info(f"Acquired leadership for {partition_key}")
-            return True
-            
-        # If not acquired, check if WE are the owner (maybe registered from before restart or same session)
-        current_owner = await self._client.get(key)
-        if current_owner == self.node_id:
-             if partition_key not in self._held_partitions:
-                self._held_partitions.append(partition_key)
-             return True
-             
-        return False
+        return True
         
     async def get_leader_node(self, partition_key: str) -> Optional[Dict[str, Any]]:
         """
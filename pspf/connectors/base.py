@@ -69,6 +69,30 @@ class BaseSink(Sink):
         # Record success
         await self.state_store.put(token, True, ttl_seconds=self.ttl_seconds)
 
+    async def write_batch(self, events: List[BaseEvent]) -> None:
+        """
+        Writes several events, enforcing idempotency like `write`.
+        Tokens are looked up in one StateStore call and recorded in one transaction,
+        instead of a lookup and a commit per event.
+        """
+        tokens = [self.generate_token(event) for event in events]
+        processed = await self.state_store.get_batch(tokens)
+        
+        written: Dict[str, None] = {}
+        try:
+            for event, token, done in zip(events, tokens, processed):
+                # Also skip repeats of the same event within this batch
+                if done or token in written:
+                    continue
+                await self.on_write(event, token)
+                written[token] = None
+        finally:
+            # Record whatever succeeded, even if a later write failed
+            if written:
+                async with self.state_store.transaction():
+                    for token in written:
+                        await self.state_store.put(token, True, ttl_seconds=self.ttl_seconds)
+
     @abstractmethod
     async def on_write(self, event: BaseEvent, idempotency_token: str) -> None:
         """
@@ -146,6 +170,13 @@ class StreamingBackend(ABC):
         """
         pass
         
+    async def add_events(self, events: List[Dict[str, Any]], max_len: Optional[int] = None) -> List[str]:
+        """
+        Publish several events, in order, returning their message IDs.
+        Backends with a network round trip per call should override this to batch.
+        """
+        return [await self.add_event(data, max_len=max_len) for data in events]
+        
     @abstractmethod
     async def claim_stuck_messages(self, min_idle_time_ms: int = 60000, count: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
         """
@@ -158,6 +189,13 @@ class StreamingBackend(ABC):
         """Increment and return the retry count for a message."""
         pass
         
+    async def increment_retry_counts(self, message_ids: List[str]) -> List[int]:
+        """
+        Increment and return the retry counts for several messages, in order.
+        Backends with a network round trip per call should override this to batch.
+        """
+        return [await self.increment_retry_count(message_id) for message_id in message_ids]
+        
     @abstractmethod
     async def move_to_dlq(self, message_id: str, data: Dict[str, Any], error: str) -> None:
         """Move a failed message to the Dead Letter Queue."""
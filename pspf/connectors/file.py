@@ -3,10 +3,18 @@ import json
 import os
 from typing import Any, Dict, List, Optional, Tuple
 from pspf.connectors.base import StreamingBackend
+from pspf.utils.json import dumps_bytes
 from pspf.utils.logging import get_logger
 
 logger = get_logger("FileBackend")
 
+def _encode_line(data: Dict[str, Any]) -> bytes:
+    return dumps_bytes(data) + b"\n"
+
+def _append_line(path: str, line: bytes) -> None:
+    with open(path, 'ab') as f:
+        f.write(line)
+
 class FileStreamBackend(StreamingBackend):
     """
     Very simple file-based backend that reads/writes line-delimited JSON.
@@ -55,7 +63,7 @@ class FileStreamBackend(StreamingBackend):
         """Reads a batch of lines from the file."""
         messages: List[Tuple[str, Dict[str, Any]]] = []
         try:
-            with open(self.path, 'r') as f:
+            with open(self.path, 'r', encoding='utf-8') as f:
                 # Naive implementation: skip to current offset
                 for _ in range(self._current_offset):
                     f.readline()
@@ -85,8 +93,8 @@ class FileStreamBackend(StreamingBackend):
     async def add_event(self, data: Dict[str, Any], max_len: Optional[int] = None) -> str:
         """Appends a JSON line to the file."""
         try:
-            with open(self.path, 'a') as f:
-                f.write(json.dumps(data) + "\n")
+            # Blocking file I/O runs off the event loop
+            await asyncio.to_thread(_append_line, self.path, _encode_line(data))
             # In accurate file-log we'd return the byte offset, 
             # but for this simple backend we'll just return a success dummy.
             return "ok"
@@ -102,9 +110,8 @@ class FileStreamBackend(StreamingBackend):
 
     async def move_to_dlq(self, message_id: str, data: Dict[str, Any], error: str) -> None:
         dlq_path = f"{self.path}.dlq"
-        with open(dlq_path, 'a') as f:
-            data["_error"] = error
-            f.write(json.dumps(data) + "\n")
+        data["_error"] = error
+        await asyncio.to_thread(_append_line, dlq_path, _encode_line(data))
 
     async def get_pending_info(self) -> Dict[str, Any]:
         return {"pending": 0, "lag": 0, "consumers": 1}
@@ -10,13 +10,28 @@ try:
     KAFKA_AVAILABLE = True
 except ImportError:
     KAFKA_AVAILABLE = False
-    
+
 from pspf.connectors.base import StreamingBackend
 from pspf.state.store import StateStore
+from pspf.utils.json import dumps_bytes, loads
 from pspf.utils.logging import get_logger
 
 logger = get_logger("KafkaBackend")
 
+def serialize_value(value: Dict[str, Any]) -> bytes:
+    """Producer value serializer. Uses orjson if available, otherwise json."""
+    return dumps_bytes(value)
+
+def serialize_key(key: Optional[Any]) -> Optional[bytes]:
+    """Producer key serializer. Strings are utf-8 encoded, bytes pass through."""
+    if isinstance(key, str):
+        return key.encode("utf-8")
+    return key
+
+def deserialize_value(raw: bytes) -> Any:
+    """Inverse of serialize_value."""
+    return loads(raw)
+
 class KafkaStreamBackend(StreamingBackend):
     """
     Kafka (or Redpanda) implementation of StreamingBackend.
@@ -59,7 +74,11 @@ class KafkaStreamBackend(StreamingBackend):
         try:
             self.producer = AIOKafkaProducer(
                 bootstrap_servers=self.bootstrap_servers,
-                client_id=f"{self.client_id}-producer"
+                client_id=f"{self.client_id}-producer",
+                # Encoding runs inside aiokafka's send pipeline rather than in add_event
+                value_serializer=serialize_value,
+                key_serializer=serialize_key,
+                linger_ms=5
             )
             await self.producer.start()
             
@@ -106,15 +125,10 @@ class KafkaStreamBackend(StreamingBackend):
         if not self.producer:
             raise ConnectionError("Producer not connected")
             
-        # Serialize
-        payload = json.dumps(data).encode("utf-8")
-        
-        # Determine partition logic here? Or let producer duplicate.
+        # Serialization is handled by the producer's value/key serializers.
         # Ideally we use event_id as key for ordering.
-        key = data.get("event_id", "").encode("utf-8") if "event_id" in data else None
-        
         try:
-            record_metadata = await self.producer.send_and_wait(self.topic, payload, key=key)
+            record_metadata = await self.producer.send_and_wait(self.topic, data, key=data.get("event_id"))
             # Return "partition-offset" as ID
             return f"{record_metadata.partition}-{record_metadata.offset}"
         except Exception as e:
@@ -135,7 +149,7 @@ class KafkaStreamBackend(StreamingBackend):
                 for record in records:
                     msg_id = f"{record.partition}-{record.offset}"
                     try:
-                        data = json.loads(record.value.decode("utf-8"))
+                        data = deserialize_value(record.value)
                         messages.append((msg_id, data))
                     except json.JSONDecodeError:
                         logger.warning(f"Skipping non-JSON message {msg_id}")
@@ -219,8 +233,7 @@ class KafkaStreamBackend(StreamingBackend):
          if self.producer:
              data["_error"] = error
              data["_original_id"] = message_id
-             payload = json.dumps(data).encode("utf-8")
-             await self.producer.send_and_wait(dlq_topic, payload)
+             await self.producer.send_and_wait(dlq_topic, data)
 
              # Clear retry state
              if self.state_store:
@@ -1,6 +1,7 @@
 import asyncio
 import time
 import json
+from collections import defaultdict
 from typing import List, Tuple, Dict, Any, Optional
 from pspf.connectors.base import StreamingBackend
 from pspf.utils.logging import get_logger
@@ -18,14 +19,13 @@ class MemoryBackend(StreamingBackend):
         self._last_ts = 0
         self._last_seq = 0
         
-        # Format: stream_key -> [ {'_id': '...', 'data': ...} ]
+        # Format: stream_key -> [ {'_id': '...', 'data': {...}} ]
         self._streams: Dict[str, List[Dict[str, Any]]] = {}
         
-        # Format: group_name -> consumer_name -> {msg_id, ...}
-        
-        # Format: group_name -> consumer_name -> {msg_id, ...}
-        # Simplified PEL (Pending Entries List)
-        self._pel: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        # Format: (group_name, stream_key) -> {msg_id: monotonic time of last delivery}
+        # Simplified PEL (Pending Entries List): delivered but not yet acked.
+        # Ids are only unique within a stream, so delivery times live in each PEL.
+        self._pending: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(dict)
         
         # Format: group_name -> stream_key -> last_read_id
         # We need to track offsets per group
@@ -51,7 +51,7 @@ class MemoryBackend(StreamingBackend):
         """Create a new backend instance for a different topic, sharing the underlying memory structures."""
         mb = MemoryBackend(stream_key=topic, group_name=self.group_name)
         mb._streams = self._streams
-        mb._pel = self._pel
+        mb._pending = self._pending
         mb._offsets = self._offsets
         mb._retries = self._retries
         mb.dlq = self.dlq
@@ -93,8 +93,10 @@ class MemoryBackend(StreamingBackend):
             
             msg_id = f"{ts}-{self._last_seq}"
             
-            # Store internal structure
-            msg = {"_id": msg_id, **data}
+            # Store internal structure. The payload is kept separate from the id
+            # so read_batch can hand it back without a filtering copy; it is copied
+            # once here so later changes to the caller's dict don't leak in.
+            msg = {"_id": msg_id, "data": dict(data)}
             
             if self.stream_key not in self._streams:
                 self._streams[self.stream_key] = []
@@ -125,16 +127,43 @@ class MemoryBackend(StreamingBackend):
                 if self.group_name not in self._offsets:
                     self._offsets[self.group_name] = {}
                 self._offsets[self.group_name][self.stream_key] = last_id
+
+                now = time.monotonic()
+                pending = self._pending[(self.group_name, self.stream_key)]
+                for m in batch:
+                    pending[m["_id"]] = now
                 
-            # Allow clean tuple return
-            return [(m["_id"], {k:v for k,v in m.items() if k != "_id"}) for m in batch]
+            return [(m["_id"], m["data"]) for m in batch]
 
     async def ack_batch(self, message_ids: List[str]) -> None:
-        # Remove from PEL, potentially
-        pass
+        async with self._lock:
+            pending = self._pending[(self.group_name, self.stream_key)]
+            for msg_id in message_ids:
+                pending.pop(msg_id, None)
 
     async def claim_stuck_messages(self, min_idle_time_ms: int = 60000, count: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
-        return []
+        """
+        Re-deliver pending messages that have been idle for at least min_idle_time_ms.
+        """
+        async with self._lock:
+            pending = self._pending.get((self.group_name, self.stream_key))
+            if not pending:
+                return []
+
+            cutoff = time.monotonic() - (min_idle_time_ms / 1000.0)
+            stuck = {mid for mid, delivered_at in pending.items() if delivered_at <= cutoff}
+            if not stuck:
+                return []
+
+            claimed = []
+            now = time.monotonic()
+            for m in self._streams.get(self.stream_key, []):
+                if m["_id"] in stuck:
+                    claimed.append((m["_id"], m["data"]))
+                    pending[m["_id"]] = now
+                    if len(claimed) >= count:
+                        break
+            return claimed
 
     async def increment_retry_count(self, message_id: str) -> int:
         self._retries[message_id] = self._retries.get(message_id, 0) + 1
@@ -147,14 +176,14 @@ class MemoryBackend(StreamingBackend):
 
     async def get_pending_info(self) -> Dict[str, Any]:
         """
-        Returns dummy pending info for memory backend.
+        Returns pending info for memory backend.
         Calculation of real lag in memory backend is possible but skipped for brevity.
         """
         # Calculate lag: total messages - processed
         total_msgs = len(self._streams.get(self.stream_key, []))
         # This is a rough approximation
         return {
-            "pending": 0,
+            "pending": len(self._pending.get((self.group_name, self.stream_key), ())),
             "lag": total_msgs, 
             "consumers": 1
         }
@@ -5,9 +5,43 @@ from typing import Any, Dict, List, Optional, Tuple, AsyncGenerator
 import valkey.asyncio as valkey
 from valkey.exceptions import ResponseError
 
+from pspf.utils.json import dumps as _dumps, loads as _loads
 from pspf.utils.logging import get_logger
 
 logger = get_logger("ValkeyBackend")
+
+
+def _to_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    valkey-python requires primitive types (bytes, str, int, float),
+    so complex values are serialized to JSON (via orjson when installed;
+    see pspf.utils.json for how it differs from plain json).
+    """
+    safe_data = {}
+    for k, v in data.items():
+        if isinstance(v, (dict, list, bool)) or v is None:
+            safe_data[k] = _dumps(v)
+        else:
+            safe_data[k] = v
+    return safe_data
+
+# First characters a JSON text can start with (json also accepts NaN/Infinity).
+# Strings starting with anything else cannot parse, so they skip the decode attempt.
+_JSON_START = frozenset('{["-0123456789tfnNI \t\n\r')
+
+def _from_fields(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Inverse of _to_fields: string values holding JSON are decoded, others kept as-is."""
+    parsed_data = {}
+    for k, v in data.items():
+        if isinstance(v, str) and v and v[0] in _JSON_START:
+            try:
+                parsed_data[k] = _loads(v)
+            except (ValueError, TypeError):
+                parsed_data[k] = v
+        else:
+            parsed_data[k] = v
+    return parsed_data
+
 class ValkeyConnector:
     """
     Manages the connection pool to a Valkey (or Redis) server.
@@ -176,21 +210,7 @@ class ValkeyStreamBackend(StreamingBackend):
                 return []
             
             # Deserialize nested JSON strings
-            import json
-            parsed_messages = []
-            for msg_id, data in messages:
-                parsed_data = {}
-                for k, v in data.items():
-                    if isinstance(v, str):
-                        try:
-                            parsed_data[k] = json.loads(v)
-                        except (json.JSONDecodeError, TypeError):
-                            parsed_data[k] = v
-                    else:
-                        parsed_data[k] = v
-                parsed_messages.append((msg_id, parsed_data))
-                
-            return parsed_messages
+            return [(msg_id, _from_fields(data)) for msg_id, data in messages]
         except Exception as e:
             logger.error(f"Error reading batch: {e}")
             raise
@@ -219,6 +239,23 @@ class ValkeyStreamBackend(StreamingBackend):
         res: Any = await client.hincrby(self.retry_tracker_key, message_id, 1) # type: ignore
         return int(res)
 
+    async def increment_retry_counts(self, message_ids: List[str]) -> List[int]:
+        """
+        Increments retry counts for several messages in one pipelined round trip.
+        
+        Args:
+            message_ids (List[str]): The message IDs.
+            
+        Returns:
+             List[int]: The new retry counts, in the same order.
+        """
+        client = self.connector.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for message_id in message_ids:
+                pipe.hincrby(self.retry_tracker_key, message_id, 1)
+            res = await pipe.execute()
+        return [int(count) for count in res]
+
     async def move_to_dlq(self, message_id: str, data: Dict[str, Any], error: str) -> None:
         """
         Moves a message to the DLQ stream and ACKs it in the main stream.
@@ -259,13 +296,14 @@ class ValkeyStreamBackend(StreamingBackend):
         
         client = self.connector.get_client()
         
-        # Pipeline the XACK and retry cleanup
-        async with client.pipeline() as pipe:
+        # Pipeline the XACK and retry cleanup in one round trip. No MULTI/EXEC:
+        # a retry counter left behind for an ACKed message is never read again.
+        async with client.pipeline(transaction=False) as pipe:
             pipe.xack(self.stream_key, self.group_name, *message_ids)
             pipe.hdel(self.retry_tracker_key, *message_ids)
             await pipe.execute()
         
-        logger.debug(f"ACKed {len(message_ids)} messages")
+        logger.debug("ACKed %d messages", len(message_ids))
 
     async def add_event(self, data: Dict[str, Any], max_len: Optional[int] = None) -> str:
         """
@@ -278,20 +316,28 @@ class ValkeyStreamBackend(StreamingBackend):
         Returns:
              str: The generated message ID.
         """
-        # valkey-python requires primitive types (bytes, str, int, float)
-        # We need to flatten or serialize the values if they are complex
-        safe_data = {}
-        for k, v in data.items():
-            if isinstance(v, (dict, list, bool)) or v is None:
-                import json
-                safe_data[k] = json.dumps(v)
-            else:
-                safe_data[k] = v
-
         client = self.connector.get_client()
-        msg_id: Any = await client.xadd(self.stream_key, safe_data, maxlen=max_len)
+        msg_id: Any = await client.xadd(self.stream_key, _to_fields(data), maxlen=max_len)
         return str(msg_id)
 
+    async def add_events(self, events: List[Dict[str, Any]], max_len: Optional[int] = None) -> List[str]:
+        """
+        Appends several events in one pipelined round trip.
+        
+        Args:
+             events (List[Dict]): The payloads, in order.
+             max_len (Optional[int]): Max stream length.
+             
+        Returns:
+             List[str]: The generated message IDs, in the same order.
+        """
+        client = self.connector.get_client()
+        async with client.pipeline(transaction=False) as pipe:
+            for data in events:
+                pipe.xadd(self.stream_key, _to_fields(data), maxlen=max_len)
+            res = await pipe.execute()
+        return [str(msg_id) for msg_id in res]
+
     async def claim_stuck_messages(self, min_idle_time_ms: int = 60000, count: int = 10) -> List[Tuple[str, Dict[str, Any]]]:
         """
         Auto-claims pending messages from crashed consumers.
@@ -339,20 +385,7 @@ class ValkeyStreamBackend(StreamingBackend):
                 raw_messages = cast(List[Tuple[str, Dict[str, Any]]], messages)
                 
                 # Deserialize nested JSON strings
-                import json
-                parsed_messages = []
-                for msg_id, data in raw_messages:
-                    parsed_data = {}
-                    for k, v in data.items():
-                        if isinstance(v, str):
-                            try:
-                                parsed_data[k] = json.loads(v)
-                            except (json.JSONDecodeError, TypeError):
-                                parsed_data[k] = v
-                        else:
-                            parsed_data[k] = v
-                    parsed_messages.append((msg_id, parsed_data))
-                return parsed_messages
+                return [(msg_id, _from_fields(data)) for msg_id, data in raw_messages]
             return []
             return []
         except Exception as e:
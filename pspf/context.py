@@ -2,7 +2,7 @@ from dataclasses import dataclass
 from typing import Optional, Any
 from pspf.state.store import StateStore
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Context:
     """
     Context passed to processing functions.
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import AsyncIterator, List
+from typing import AsyncIterator, Dict, List
 from pspf.models import StreamRecord
 
 class Log(ABC):
@@ -31,6 +31,14 @@ class Log(ABC):
         """Return the highest available offset + 1 for a partition."""
         pass
 
+    async def get_high_watermarks_all(self) -> Dict[int, int]:
+        """
+        Return the high watermark of every partition in one call.
+        Implementations backed by a remote store should override this with a
+        single batched request; the default falls back to one call per partition.
+        """
+        return {p: await self.get_high_watermark(p) for p in range(self.partitions())}
+
 class OffsetStore(ABC):
     """
     Abstract interface for managing consumer group offsets.
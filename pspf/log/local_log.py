@@ -1,11 +1,17 @@
 import asyncio
+import bisect
+import mmap
+import sys
 import msgpack # type: ignore
 import struct
 import os
 import zlib
 import aiofiles # type: ignore
-from datetime import datetime
-from typing import AsyncIterator, List, Any, Dict, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, List, Any, Dict, Optional, Set, Tuple, cast
 from pathlib import Path
 
 from pspf.models import StreamRecord
@@ -14,6 +20,121 @@ from pspf.utils.logging import get_logger
 
 logger = get_logger("LocalLog")
 
+try:
+    import lz4.frame # type: ignore
+    HAS_LZ4 = True
+except ImportError:
+    HAS_LZ4 = False
+
+try:
+    import zstandard # type: ignore
+    HAS_ZSTD = True
+except ImportError:
+    HAS_ZSTD = False
+
+try:
+    import google_crc32c # type: ignore
+    HAS_CRC32C = True
+except ImportError:
+    HAS_CRC32C = False
+
+# Frame codec ids. Stored per frame so mixed-compression segments stay readable.
+CODEC_NONE = 0
+CODEC_LZ4 = 1
+CODEC_ZSTD = 2
+CODEC_ZLIB = 3
+
+CODECS = {None: CODEC_NONE, "lz4": CODEC_LZ4, "zstd": CODEC_ZSTD, "zlib": CODEC_ZLIB}
+
+# Set in the codec byte when the frame checksum is CRC32C rather than zlib CRC32
+FLAG_CRC32C = 0x80
+CODEC_MASK = 0x0F
+
+# Precompiled frame header: [4 byte len][4 byte crc][1 byte codec]
+_FRAME_HDR = struct.Struct(">IIB")
+HEADER_SIZE = _FRAME_HDR.size
+
+# Every segment starts with this magic; the last byte is the format version.
+# Segments without it predate the framed format and are migrated on startup.
+SEGMENT_MAGIC = b"PSPFLOG\x02"
+SEGMENT_HEADER_SIZE = len(SEGMENT_MAGIC)
+
+# Original frame header: [4 byte len][4 byte zlib crc32], payload uncompressed
+_LEGACY_FRAME_HDR = struct.Struct(">II")
+
+# Sidecar index entry: byte position of a frame within its segment.
+# Entry i belongs to offset (segment start + i).
+_INDEX_ENTRY = struct.Struct(">Q")
+
+# Per-partition frame scratch buffer: initial size, and the size above which
+# it is released after a write instead of being kept for reuse
+_SCRATCH_SIZE = 64 * 1024
+_SCRATCH_MAX = 4 * 1024 * 1024
+
+# Readahead size for LogCursor scans
+_READ_CHUNK = 1024 * 1024
+
+# Cursors kept open between read() calls, so a reader that comes back at the
+# offset it stopped at (e.g. a follower pulling) resumes without a seek
+_MAX_IDLE_CURSORS = 64
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_ONE_US = timedelta(microseconds=1)
+
+def timestamp_to_ns(ts: datetime) -> int:
+    """
+    Convert a datetime to integer nanoseconds since the epoch (microsecond precision).
+
+    Naive datetimes are converted by wall-clock arithmetic, never through the
+    local timezone, so every value (including ones in a DST gap or fold)
+    round-trips exactly.
+    """
+    if ts.utcoffset() is None:
+        return ((ts - _NAIVE_EPOCH) // _ONE_US) * 1000
+    return ((ts - _EPOCH) // _ONE_US) * 1000
+
+def timestamp_from_ns(ts_ns: int, utc_offset: Optional[int] = None) -> datetime:
+    """
+    Inverse of timestamp_to_ns. Returns a naive datetime, or an aware one in a
+    fixed-offset timezone when the original UTC offset (seconds) is given.
+    """
+    value = _NAIVE_EPOCH + timedelta(microseconds=ts_ns // 1000)
+    if utc_offset is None:
+        return value
+    tz = timezone.utc if utc_offset == 0 else timezone(timedelta(seconds=utc_offset))
+    return value.replace(tzinfo=timezone.utc).astimezone(tz)
+
+def _crc32c_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+_CRC32C_TABLE = _crc32c_table()
+
+def crc32c_py(data: bytes) -> int:
+    """
+    Pure-Python CRC32C. Much slower than google-crc32c; it only exists so
+    frames written with hardware CRC32C stay readable without the package.
+    """
+    crc = 0xffffffff
+    table = _CRC32C_TABLE
+    for b in data:
+        crc = table[(crc ^ b) & 0xff] ^ (crc >> 8)
+    return crc ^ 0xffffffff
+
+def frame_checksum(flags: int, payload: bytes) -> int:
+    """Checksum of a stored payload, using the algorithm recorded in the frame flags."""
+    if flags & FLAG_CRC32C:
+        if HAS_CRC32C:
+            return int(google_crc32c.value(payload))
+        return crc32c_py(payload)
+    return zlib.crc32(payload) & 0xffffffff
+
 class LocalLog(Log):
     """
     Native file-based implementation of the Log interface.
@@ -22,30 +143,84 @@ class LocalLog(Log):
     - Partitioning by hash(key)
     - Append-only log files per partition
     - Binary MessagePack format with CRC32 Checksums
+    - Optional per-frame compression (lz4, zstd or zlib)
     - Startup Recovery & Safe Truncation
     
     Format:
-    [Length (4B Big Endian)][CRC32 (4B Big Endian)][Payload (MsgPack)]
+    [Magic "PSPFLOG" + Version (8B)] followed by frames of
+    [Length (4B Big Endian)][CRC32 (4B Big Endian)][Codec (1B)][Payload (MsgPack, maybe compressed)]
+
+    Length and CRC cover the stored (compressed) payload. The high bit of the
+    codec byte marks a CRC32C checksum. Writers use CRC32C when google-crc32c
+    is installed and zlib CRC32 otherwise; readers verify either, with a slow
+    pure-Python CRC32C fallback so logs stay readable without the package.
+
+    Timestamps are stored as epoch nanoseconds. Naive values come back naive
+    and unchanged; aware values keep their UTC offset but come back in a
+    fixed-offset timezone (zone names such as a ZoneInfo key are not stored).
     """
     
-    def __init__(self, data_dir: str, num_partitions: int = 4, max_segment_size: int = 100 * 1024 * 1024):
+    def __init__(self, data_dir: str, num_partitions: int = 4, max_segment_size: int = 100 * 1024 * 1024, compression: Optional[str] = None):
+        if compression not in CODECS:
+            raise ValueError(f"Unsupported compression '{compression}'. Choose from lz4, zstd, zlib or None.")
+        if compression == "lz4" and not HAS_LZ4:
+            raise ImportError("lz4 is required for compression='lz4'. Install it with `pip install lz4`.")
+        if compression == "zstd" and not HAS_ZSTD:
+            raise ImportError("zstandard is required for compression='zstd'. Install it with `pip install zstandard`.")
+
         self._data_dir = Path(data_dir)
+        self._codec = CODECS[compression]
+        # zstd (de)compression contexts are built once and reused for every frame
+        self._zstd_compressor: Any = zstandard.ZstdCompressor(level=1) if self._codec == CODEC_ZSTD else None
+        self._zstd_decompressor: Any = None
+        # Reused across appends; packing is synchronous so one packer is safe on the loop
+        self._packer = msgpack.Packer()
+        # Hardware-accelerated CRC32C when available; readers verify either per frame
+        self._frame_flags = self._codec | (FLAG_CRC32C if HAS_CRC32C else 0)
         self._num_partitions = num_partitions
+        # Power-of-two partition counts route with a bitmask instead of modulo
+        self._mask: Optional[int] = num_partitions - 1 if num_partitions & (num_partitions - 1) == 0 else None
         self._max_segment_size = max_segment_size
         self._locks = [asyncio.Lock() for _ in range(num_partitions)]
         # Cache for next assignable offset per partition
         self._next_offsets: Dict[int, int] = {} 
+        # Offset index: partition -> segment start offset -> byte position of each frame.
+        # Lets readers seek straight to an offset instead of scanning the segment.
+        self._offset_index: Dict[int, Dict[int, List[int]]] = {}
+        # Sorted (start_offset, path) per partition. Built by recovery and kept
+        # current on rotation and cleanup, so the hot paths never list the directory.
+        self._segments: Dict[int, List[Tuple[int, Path]]] = {}
+        # Long-lived append handles for the active segment of each partition,
+        # opened on first append and replaced on rotation.
+        self._writers: Dict[int, Any] = {}
+        self._index_writers: Dict[int, Any] = {}
+        self._writer_positions: Dict[int, int] = {}
+        # Reusable frame buffers; only touched under the partition lock
+        self._scratch: Dict[int, bytearray] = {}
+        # Partitions whose last write was interrupted and must be re-read from disk
+        self._unsynced: Set[int] = set()
+        # Cursors parked by read() at the offset they stopped at, oldest first
+        self._idle_cursors: "OrderedDict[Tuple[int, int], LogCursor]" = OrderedDict()
+        # Group commit queue: records waiting for the next write on each partition
+        self._pending: Dict[int, List[Tuple[StreamRecord, asyncio.Future]]] = {p: [] for p in range(num_partitions)}
         
         self._data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Initialize
-        for p in range(num_partitions):
-            self._recover_partition_sync(p)
+        # Initialize. Partitions have independent files, so recover them in parallel;
+        # each worker only writes its own partition's entries.
+        if num_partitions > 1:
+            with ThreadPoolExecutor(max_workers=min(num_partitions, 32)) as pool:
+                list(pool.map(self._recover_partition_sync, range(num_partitions)))
+        else:
+            for p in range(num_partitions):
+                self._recover_partition_sync(p)
 
     def partitions(self) -> int:
         return self._num_partitions
 
     def _get_partition(self, key: str) -> int:
+        if self._mask is not None:
+            return hash(key) & self._mask
         return hash(key) % self._num_partitions
 
     def _get_segment_path(self, partition: int, start_offset: int) -> Path:
@@ -75,17 +250,22 @@ class LocalLog(Log):
     def _recover_partition_sync(self, partition: int) -> None:
         """
         Synchronous startup recovery.
-        Scans all segments to verify integrity and find the high water mark.
+        Recovers every segment (see _recover_segment) to find the high water mark.
         Truncates corrupt tails in segments if found.
         """
         segments = self._list_segments(partition)
+        index: Dict[int, List[int]] = {}
+        self._offset_index[partition] = index
+        self._segments[partition] = segments
         
         # If no segments, initialize clean state
         if not segments:
             # Create first segment starting at 0
             first_seg = self._get_segment_path(partition, 0)
-            first_seg.touch()
+            first_seg.write_bytes(SEGMENT_MAGIC)
             self._next_offsets[partition] = 0
+            index[0] = []
+            segments.append((0, first_seg))
             return
 
         total_valid_records = 0
@@ -95,53 +275,220 @@ class LocalLog(Log):
         # integrity is paramount. We scan the LAST segment for sure.
         # We also check if earlier segments are "complete" (no fragments at end).
         
-        for idx, (seg_start_offset, seg_path) in enumerate(segments):
-            valid_in_seg = 0
-            is_last = (idx == len(segments) - 1)
+        for seg_start_offset, seg_path in segments:
+            positions = self._recover_segment(seg_path)
+            index[seg_start_offset] = positions
             
-            with open(seg_path, 'r+b') as f:
-                while True:
-                    pos = f.tell()
-                    header = f.read(8) # 4 bytes len + 4 bytes crc
-                    if not header or len(header) < 8:
-                        if len(header) > 0:
-                            logger.warning(f"Truncating partial header at end of {seg_path.name} (pos {pos})")
-                            f.seek(pos)
-                            f.truncate()
+            # The start_offset of the segment + valid records we found
+            # should ideally match the next segment's start offset.
+            total_valid_records = seg_start_offset + len(positions)
+
+        self._next_offsets[partition] = total_valid_records
+        logger.info(f"Partition {partition} recovered. High Watermark: {self._next_offsets[partition]}")
+
+    def _recover_segment(self, seg_path: Path) -> List[int]:
+        """
+        Recover the frame positions of a segment, trusting its .idx sidecar
+        for everything up to the last indexed frame and scanning only the tail.
+        Falls back to a full scan if the sidecar is missing or inconsistent,
+        and rewrites the sidecar whenever it does not match the result.
+
+        Tradeoff: with a valid sidecar only the last indexed frame and the
+        unindexed tail are checksummed at startup. Corruption earlier in the
+        segment is not caught here; LogCursor verifies every frame's CRC when
+        it is read and stops at a bad one.
+        """
+        self._check_segment_header(seg_path)
+        idx_path = seg_path.with_suffix(".idx")
+        positions = self._load_index(seg_path, idx_path)
+
+        resume_pos = SEGMENT_HEADER_SIZE
+        if positions:
+            with open(seg_path, 'rb') as f:
+                f.seek(positions[-1])
+                header = f.read(HEADER_SIZE)
+                length, stored_crc, flags = _FRAME_HDR.unpack(header)
+                payload = f.read(length)
+            if len(payload) == length and frame_checksum(flags, payload) == stored_crc:
+                resume_pos = positions[-1] + HEADER_SIZE + length
+            else:
+                logger.warning(f"Index {idx_path.name} does not match segment. Rescanning.")
+                positions = []
+
+        rescanned = not positions
+        positions.extend(self._scan_segment(seg_path, resume_pos))
+        # Appends extend the sidecar in place, so it must hold exactly these entries
+        if rescanned or idx_path.stat().st_size != len(positions) * _INDEX_ENTRY.size:
+            self._write_index(idx_path, positions)
+        return positions
+
+    def _check_segment_header(self, seg_path: Path) -> None:
+        """
+        Make sure a segment starts with the current format's magic.
+
+        A missing or torn magic on a segment with no frames is rewritten, and
+        segments from before the magic existed are migrated. Anything else is
+        refused: a segment that does not parse as this format is never truncated.
+        """
+        with open(seg_path, 'rb') as f:
+            head = f.read(SEGMENT_HEADER_SIZE)
+        if head == SEGMENT_MAGIC:
+            return
+        if SEGMENT_MAGIC.startswith(head):
+            # Crashed between creating the segment and writing its magic
+            with open(seg_path, 'wb') as f:
+                f.write(SEGMENT_MAGIC)
+            return
+        if head.startswith(SEGMENT_MAGIC[:-1]):
+            raise RuntimeError(
+                f"{seg_path.name} uses segment format version {head[-1]}, "
+                f"but this version of pspf reads version {SEGMENT_MAGIC[-1]}."
+            )
+        self._migrate_legacy_segment(seg_path)
+
+    def _migrate_legacy_segment(self, seg_path: Path) -> None:
+        """
+        Rewrite a segment from the original [len][crc32][payload] framing.
+
+        Payloads and checksums are copied as-is into uncompressed, zlib CRC32
+        frames. The new segment is written next to the old one and swapped in
+        atomically. If the legacy segment ends in bytes that are not valid
+        frames, the original is kept as `<name>.legacy` rather than dropped.
+        """
+        tmp_path = seg_path.with_suffix(".migrating")
+        frames = 0
+        size = seg_path.stat().st_size
+        with open(seg_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            dst.write(SEGMENT_MAGIC)
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = 0
+                while size - pos >= _LEGACY_FRAME_HDR.size:
+                    length, stored_crc = _LEGACY_FRAME_HDR.unpack_from(mm, pos)
+                    end = pos + _LEGACY_FRAME_HDR.size + length
+                    if end > size:
+                        break
+                    payload = mm[pos + _LEGACY_FRAME_HDR.size:end]
+                    if zlib.crc32(payload) & 0xffffffff != stored_crc:
                         break
-                    
-                    length = struct.unpack(">I", header[0:4])[0]
-                    stored_crc = struct.unpack(">I", header[4:8])[0]
-                    
-                    payload = f.read(length)
-                    if len(payload) < length:
+                    dst.write(_FRAME_HDR.pack(length, stored_crc, CODEC_NONE))
+                    dst.write(payload)
+                    frames += 1
+                    pos = end
+            dst.flush()
+            os.fsync(dst.fileno())
+
+        if pos < size:
+            backup = seg_path.with_suffix(".legacy")
+            logger.warning(
+                f"{seg_path.name} has {size - pos} unreadable bytes at pos {pos}. "
+                f"Keeping the original segment as {backup.name}."
+            )
+            os.replace(seg_path, backup)
+        os.replace(tmp_path, seg_path)
+        seg_path.with_suffix(".idx").unlink(missing_ok=True)
+        logger.info(f"Migrated legacy segment {seg_path.name} ({frames} frames)")
+
+    def _load_index(self, seg_path: Path, idx_path: Path) -> List[int]:
+        """Read a sidecar index, discarding it if it cannot describe the segment."""
+        if not idx_path.exists():
+            return []
+        data = idx_path.read_bytes()
+        entries = array('Q')
+        entries.frombytes(data[:len(data) - len(data) % _INDEX_ENTRY.size])
+        if sys.byteorder == "little":
+            entries.byteswap()
+        if not entries:
+            return []
+        size = seg_path.stat().st_size
+        if entries[0] != SEGMENT_HEADER_SIZE or entries[-1] + HEADER_SIZE > size:
+            return []
+        return entries.tolist()
+
+    def _write_index(self, idx_path: Path, positions: List[int]) -> None:
+        entries = array('Q', positions)
+        if sys.byteorder == "little":
+            entries.byteswap()
+        with open(idx_path, 'wb') as f:
+            f.write(entries.tobytes())
+
+    def _scan_segment(self, seg_path: Path, start_pos: int = SEGMENT_HEADER_SIZE) -> List[int]:
+        """
+        Validate every frame in a segment from start_pos and return their byte positions.
+        Truncates the file at the first partial or corrupt frame.
+
+        The segment is memory-mapped so headers are unpacked in place and
+        payloads sliced out without a read syscall per frame.
+        """
+        positions: List[int] = []
+        size = seg_path.stat().st_size
+        if size <= start_pos:
+            return positions
+
+        truncate_at: Optional[int] = None
+        with open(seg_path, 'r+b') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                pos = start_pos
+                while pos < size:
+                    if size - pos < HEADER_SIZE:
+                        logger.warning(f"Truncating partial header at end of {seg_path.name} (pos {pos})")
+                        truncate_at = pos
+                        break
+                        
+                    length, stored_crc, flags = _FRAME_HDR.unpack_from(mm, pos)
+                    end = pos + HEADER_SIZE + length
+                    if end > size:
                         logger.warning(f"Truncating partial payload at end of {seg_path.name} (pos {pos})")
-                        f.seek(pos)
-                        f.truncate()
+                        truncate_at = pos
                         break
-                    
+                        
                     # Checksum verify
-                    computed_crc = zlib.crc32(payload) & 0xffffffff
+                    computed_crc = frame_checksum(flags, mm[pos + HEADER_SIZE:end])
                     if computed_crc != stored_crc:
                         logger.error(f"CRC Mismatch at pos {pos} in {seg_path.name}. Truncating.")
-                        f.seek(pos)
-                        f.truncate()
+                        truncate_at = pos
                         break
-                    
-                    valid_in_seg += 1
+                        
+                    positions.append(pos)
+                    pos = end
             
-            # The start_offset of the segment + valid records we found
-            # should ideally match the next segment's start offset.
-            total_valid_records = seg_start_offset + valid_in_seg
+            # The map must be closed before the file can be truncated
+            if truncate_at is not None:
+                f.truncate(truncate_at)
+        return positions
 
-        self._next_offsets[partition] = total_valid_records
-        logger.info(f"Partition {partition} recovered. High Watermark: {self._next_offsets[partition]}")
+    def _compress(self, payload: bytes) -> bytes:
+        codec = self._codec
+        if codec == CODEC_NONE:
+            return payload
+        if codec == CODEC_LZ4:
+            return cast(bytes, lz4.frame.compress(payload))
+        if codec == CODEC_ZSTD:
+            return cast(bytes, self._zstd_compressor.compress(payload))
+        return zlib.compress(payload, 1)
+
+    def _decompress(self, codec: int, payload: bytes) -> bytes:
+        codec &= CODEC_MASK
+        if codec == CODEC_NONE:
+            return payload
+        if codec == CODEC_ZLIB:
+            return zlib.decompress(payload)
+        if codec == CODEC_LZ4:
+            if not HAS_LZ4:
+                raise ImportError("lz4 is required to read lz4-compressed frames. Install it with `pip install lz4`.")
+            return cast(bytes, lz4.frame.decompress(payload))
+        if codec == CODEC_ZSTD:
+            if self._zstd_decompressor is None:
+                if not HAS_ZSTD:
+                    raise ImportError("zstandard is required to read zstd-compressed frames. Install it with `pip install zstandard`.")
+                self._zstd_decompressor = zstandard.ZstdDecompressor()
+            return cast(bytes, self._zstd_decompressor.decompress(payload))
+        raise ValueError(f"Unknown codec id {codec}")
 
     async def _get_active_segment_path(self, partition: int) -> Path:
         """
         Returns the path of the current active segment for writing.
         """
-        segments = self._list_segments(partition)
+        segments = self._segments.get(partition)
         if segments:
             return segments[-1][1]
         # Should be initialized in recovery, but safe fallback:
@@ -150,106 +497,269 @@ class LocalLog(Log):
     async def get_high_watermark(self, partition: int) -> int:
         return self._next_offsets.get(partition, 0)
 
+    async def get_high_watermarks_all(self) -> Dict[int, int]:
+        next_offsets = self._next_offsets
+        return {p: next_offsets.get(p, 0) for p in range(self._num_partitions)}
+
     async def append(self, record: StreamRecord) -> None:
-        partition = self._get_partition(record.key)
-        record.partition = partition
-        
-        async with self._locks[partition]:
+        await self.append_batch([record])
+
+    async def append_batch(self, records: List[StreamRecord]) -> None:
+        """
+        Append records, coalescing them with any concurrent appends to the
+        same partition (group commit).
+
+        Each record is queued on its partition. Whichever caller next holds the
+        partition lock drains the whole queue with a single write, so K appends
+        that arrive while a write is in flight cost one write, not K.
+        """
+        await self._append_partitioned([(self._get_partition(r.key), r) for r in records])
+
+    async def append_with_partition(self, partition: int, record: StreamRecord) -> None:
+        """Append a record whose partition the caller has already computed."""
+        await self._append_partitioned([(partition, record)])
+
+    async def _append_partitioned(self, items: List[Tuple[int, StreamRecord]]) -> None:
+        loop = asyncio.get_running_loop()
+        waiters: List[Tuple[int, asyncio.Future]] = []
+        for partition, record in items:
+            record.partition = partition
+            fut = loop.create_future()
+            self._pending[partition].append((record, fut))
+            waiters.append((partition, fut))
+
+        try:
+            for partition, fut in waiters:
+                if not fut.done():
+                    async with self._locks[partition]:
+                        if not fut.done():
+                            await self._flush_pending(partition)
+                fut.result()
+        except asyncio.CancelledError:
+            # Withdraw our records that no write has picked up yet
+            ours = {fut for _, fut in waiters}
+            for partition in {partition for partition, _ in waiters}:
+                self._pending[partition] = [item for item in self._pending[partition] if item[1] not in ours]
+            raise
+
+    async def _flush_pending(self, partition: int) -> None:
+        """
+        Write every queued record for a partition. Caller must hold the partition lock.
+
+        The write runs in its own task and every queued future is settled from
+        its outcome. If the caller is cancelled mid-write, it still waits for the
+        write (the worker thread doing it cannot be interrupted), settles the
+        batch for the other coalesced callers, and only then re-raises.
+        """
+        batch = self._pending[partition]
+        self._pending[partition] = []
+        write = asyncio.ensure_future(self._write_records(partition, [record for record, _ in batch]))
+        cancelled = False
+        while not write.done():
+            try:
+                await asyncio.shield(write)
+            except asyncio.CancelledError:
+                cancelled = cancelled or not write.cancelled()
+            except Exception:
+                pass
+
+        error: Optional[BaseException]
+        if write.cancelled():
+            error = RuntimeError(f"Write to partition {partition} was cancelled; its records may or may not be on disk")
+        else:
+            error = write.exception()
+        for _, fut in batch:
+            if not fut.done():
+                if error is None:
+                    fut.set_result(None)
+                else:
+                    fut.set_exception(error)
+        if cancelled:
+            raise asyncio.CancelledError()
+
+    async def _write_records(self, partition: int, records: List[StreamRecord]) -> None:
+        index = self._offset_index[partition]
+        if partition in self._unsynced:
+            await self._resync_active_segment(partition)
+        writer = self._writers.get(partition)
+        if writer is None:
             active_path = await self._get_active_segment_path(partition)
-            
-            # Check for Rotation BEFORE writing
-            # If current file is too big, start a new one
-            if active_path.exists() and active_path.stat().st_size >= self._max_segment_size:
-                 next_offset = self._next_offsets[partition]
-                 new_path = self._get_segment_path(partition, next_offset)
-                 new_path.touch()
-                 active_path = new_path
-            
-            offset = self._next_offsets[partition]
+            writer = await self._open_writer(partition, active_path)
+        write_pos = self._writer_positions[partition]
+        
+        # Check for Rotation BEFORE writing
+        # If current file is too big, start a new one.
+        # A batch is never split, so a segment may overshoot by one batch.
+        if write_pos >= self._max_segment_size:
+             next_offset = self._next_offsets[partition]
+             new_path = self._get_segment_path(partition, next_offset)
+             writer = await self._open_writer(partition, new_path)
+             index[next_offset] = []
+             self._segments[partition].append((next_offset, new_path))
+             write_pos = self._writer_positions[partition]
+        
+        offset = self._next_offsets[partition]
+        buf = self._scratch.get(partition)
+        if buf is None:
+            buf = self._scratch[partition] = bytearray(_SCRATCH_SIZE)
+        end = 0
+        positions: List[int] = []
+        for record in records:
             record.offset = offset
-            
+            # Partition and offset are implied by the frame's location, so they are
+            # not stored; tz (UTC offset in seconds) is only written for aware timestamps.
+            timestamp = record.timestamp
             data = {
                 "id": record.id,
                 "key": record.key,
                 "value": record.value,
                 "event_type": getattr(record, "event_type", ""),
-                "timestamp": record.timestamp.isoformat(),
-                "partition": partition,
-                "offset": offset
+                "ts_ns": timestamp_to_ns(timestamp)
             }
+            utc_offset = timestamp.utcoffset()
+            if utc_offset is not None:
+                data["tz"] = int(utc_offset.total_seconds())
             
-            payload = msgpack.packb(data)
+            payload = self._compress(self._packer.pack(data))
             length = len(payload)
-            crc = zlib.crc32(payload) & 0xffffffff
-            
-            # Frame: [4 byte len][4 byte crc][payload]
-            frame = struct.pack(">II", length, crc) + payload
+            crc = frame_checksum(self._frame_flags, payload)
             
-            async with aiofiles.open(active_path, mode='ab') as f:
-                await f.write(frame)
-            
-            self._next_offsets[partition] += 1
+            # Frame: [4 byte len][4 byte crc][1 byte codec][payload]
+            frame_pos = end
+            end = frame_pos + HEADER_SIZE + length
+            if end > len(buf):
+                buf.extend(bytes(max(end - len(buf), len(buf))))
+            _FRAME_HDR.pack_into(buf, frame_pos, length, crc, self._frame_flags)
+            buf[frame_pos + HEADER_SIZE:end] = payload
+            positions.append(write_pos + frame_pos)
+            offset += 1
+        
+        active_start = next(reversed(index))
+        try:
+            await writer.write(memoryview(buf)[:end])
+            # Sidecar index is written after the data, so it never points past it
+            await self._index_writers[partition].write(
+                b"".join(_INDEX_ENTRY.pack(pos) for pos in positions)
+            )
+        except asyncio.CancelledError:
+            # The write may still be running in its worker thread. Leave the
+            # buffer to it and re-read the segment before the next append.
+            self._scratch.pop(partition, None)
+            self._unsynced.add(partition)
+            raise
+        except Exception:
+            # The worker thread has finished: roll the files back to the last
+            # committed frame so they match the offsets handed out.
+            self._scratch.pop(partition, None)
+            await self._close_writer(partition)
+            await self._close_idle_cursors(partition)
+            seg_path = self._segments[partition][-1][1]
+            os.truncate(seg_path, write_pos)
+            os.truncate(seg_path.with_suffix(".idx"), len(index[active_start]) * _INDEX_ENTRY.size)
+            raise
+
+        if len(buf) > _SCRATCH_MAX:
+            del self._scratch[partition]
+        self._writer_positions[partition] = write_pos + end
+        # Active segment is always the last one indexed
+        index[active_start].extend(positions)
+        self._next_offsets[partition] = offset
+
+    async def _resync_active_segment(self, partition: int) -> None:
+        """Rebuild a partition's write position from disk after a write with an unknown outcome."""
+        await self._close_writer(partition)
+        start_offset, seg_path = self._segments[partition][-1]
+        positions = await asyncio.to_thread(self._recover_segment, seg_path)
+        self._offset_index[partition][start_offset] = positions
+        self._next_offsets[partition] = start_offset + len(positions)
+        self._unsynced.discard(partition)
+
+    async def _open_writer(self, partition: int, path: Path) -> Any:
+        """
+        Open an unbuffered append handle so every write is visible to readers immediately,
+        along with its .idx sidecar. Closes the previous segment's handles.
+        New segments get the format magic before any frame.
+        """
+        await self._close_writer(partition)
+        writer = await aiofiles.open(path, mode='ab', buffering=0)
+        self._writers[partition] = writer
+        self._index_writers[partition] = await aiofiles.open(path.with_suffix(".idx"), mode='ab', buffering=0)
+        position = path.stat().st_size
+        if position == 0:
+            await writer.write(SEGMENT_MAGIC)
+            position = SEGMENT_HEADER_SIZE
+        self._writer_positions[partition] = position
+        return writer
+
+    async def _close_writer(self, partition: int) -> None:
+        writer = self._writers.pop(partition, None)
+        if writer is not None:
+            await writer.close()
+        index_writer = self._index_writers.pop(partition, None)
+        if index_writer is not None:
+            await index_writer.close()
+
+    async def close(self) -> None:
+        """Close all open segment writers and idle cursors."""
+        for partition in list(self._writers):
+            async with self._locks[partition]:
+                await self._close_writer(partition)
+        await self._close_idle_cursors()
+
+    def _decode_record(self, codec: int, payload: bytes, partition: int, offset: int) -> StreamRecord:
+        """Deserialize a frame payload back into a StreamRecord."""
+        data = msgpack.unpackb(self._decompress(codec, payload))
+        ts_ns = data.get("ts_ns")
+        if ts_ns is not None:
+            timestamp = timestamp_from_ns(ts_ns, data.get("tz"))
+        else:
+            timestamp = datetime.fromisoformat(data["timestamp"])
+        return StreamRecord(
+            id=data.get("id", ""),
+            key=data.get("key", ""),
+            value=data.get("value"),
+            event_type=data.get("event_type", ""),
+            timestamp=timestamp,
+            partition=data.get("partition", partition),
+            offset=data.get("offset", offset)
+        )
+
+    def cursor(self, partition: int, offset: int) -> "LogCursor":
+        """
+        Open a tail-following cursor on a partition starting at `offset`.
+        The cursor keeps its segment file open between polls.
+        """
+        return LogCursor(self, partition, offset)
 
     async def read(self, partition: int, offset: int) -> AsyncIterator[StreamRecord]:
-        segments = self._list_segments(partition)
-        
-        for start_offset, path in segments:
-            # Skip segments that end before requested offset
-            # We don't know exact end offset without opening, but we know the NEXT segment's start.
-            # So if requested offset >= next_segment_start, we can skip this one.
-            # Finding the index of this segment in the list:
-            idx = segments.index((start_offset, path))
-            next_start = segments[idx+1][0] if idx + 1 < len(segments) else float('inf')
-            
-            if offset >= next_start:
-                continue
-            
-            # This segment might contain our offset.
-            # Local offset within this segment is tricky because records are variable length.
-            # We have to scan from start of the segment if it's the target segment.
-            # Optimization: If we are reading sequentially, we scan. 
-            # Ideally we'd have an index, but for now we scan.
-            
-            current_log_offset = start_offset
-            
-            async with aiofiles.open(path, mode='rb') as f:
-                while True:
-                    header = await f.read(8)
-                    if not header or len(header) < 8:
-                        break
-                    
-                    length = struct.unpack(">I", header[0:4])[0]
-                    stored_crc = struct.unpack(">I", header[4:8])[0]
-                    
-                    payload = await f.read(length)
-                    if len(payload) < length:
-                        break # Truncated
-                    
-                    # Only calculate/deserialize if we are at or past the requested offset
-                    if current_log_offset >= offset:
-                         computed_crc = zlib.crc32(payload) & 0xffffffff
-                         if computed_crc != stored_crc:
-                             logger.error(f"CRC Mismatch reading {path} at offset {current_log_offset}")
-                             # Stop reading this segment? Or skip? 
-                             # For safety, we stop.
-                             break
-                             
-                         try:
-                             data = msgpack.unpackb(payload)
-                             yield StreamRecord(
-                                 id=data.get("id", ""),
-                                 key=data.get("key", ""),
-                                 value=data.get("value"),
-                                 event_type=data.get("event_type", ""),
-                                 timestamp=datetime.fromisoformat(data["timestamp"]),
-                                 partition=data.get("partition", partition),
-                                 offset=data.get("offset", current_log_offset)
-                             )
-                         except Exception as e:
-                             logger.error(f"Deserialization error: {e}")
-                             break
-
-                    current_log_offset += 1
+        """
+        Yield records from `offset` to the current end of the partition.
+
+        The cursor is parked when the read ends (or the caller stops early and
+        closes the iterator), so a read that resumes where the last one stopped
+        picks up its open file and position instead of seeking again.
+        """
+        cursor = self._idle_cursors.pop((partition, offset), None) or self.cursor(partition, offset)
+        try:
+            async for record in cursor.poll():
+                yield record
+        finally:
+            await self._park_cursor(cursor)
+
+    async def _park_cursor(self, cursor: "LogCursor") -> None:
+        if cursor._file is None:
+            return
+        replaced = self._idle_cursors.pop((cursor.partition, cursor.offset), None)
+        self._idle_cursors[(cursor.partition, cursor.offset)] = cursor
+        if replaced is not None:
+            await replaced.close()
+        while len(self._idle_cursors) > _MAX_IDLE_CURSORS:
+            _, oldest = self._idle_cursors.popitem(last=False)
+            await oldest.close()
+
+    async def _close_idle_cursors(self, partition: Optional[int] = None) -> None:
+        for key in [k for k in self._idle_cursors if partition is None or k[0] == partition]:
+            await self._idle_cursors.pop(key).close()
 
     async def cleanup(self, retention_days: int) -> None:
         """Deletes old segments."""
@@ -258,9 +768,158 @@ class LocalLog(Log):
         cutoff = now - (retention_days * 86400)
         
         for p in range(self._num_partitions):
-            segments = self._list_segments(p)
+            segments = self._segments[p]
             # Never delete the last (active) segment
             for start_offset, path in segments[:-1]:
                 if path.stat().st_mtime < cutoff:
                     logger.info(f"Deleting old segment {path.name}")
                     path.unlink()
+                    path.with_suffix(".idx").unlink(missing_ok=True)
+                    self._offset_index.get(p, {}).pop(start_offset, None)
+            self._segments[p] = [seg for seg in segments if seg[1].exists()]
+
+
+class LogCursor:
+    """
+    Persistent read position on a single LocalLog partition.
+
+    Holds the open segment file and byte position across polls, so a consumer
+    that polls repeatedly (like `tail -f`) does not reopen the segment and
+    rescan it from the start each time. Each `poll()` yields every complete
+    frame currently on disk and returns at EOF; callers sleep and poll again.
+    """
+    def __init__(self, log: LocalLog, partition: int, offset: int) -> None:
+        self._log = log
+        self.partition = partition
+        # Next logical offset to yield
+        self.offset = offset
+        self._file: Any = None
+        self._path: Optional[Path] = None
+        self._pos = 0
+
+    async def _open_file(self, path: Path) -> None:
+        self._file = await aiofiles.open(path, mode='rb')
+        self._path = path
+        self._pos = SEGMENT_HEADER_SIZE
+        if hasattr(os, "posix_fadvise"):
+            # Cursors scan forward; let the kernel read ahead aggressively
+            os.posix_fadvise(self._file.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+    async def _open_segment(self) -> bool:
+        """
+        Open the segment containing self.offset and skip forward to it.
+        Returns False if the offset is not on disk yet.
+        """
+        segments = self._log._segments.get(self.partition, [])
+        i = bisect.bisect_right(segments, self.offset, key=lambda seg: seg[0]) - 1
+        if i < 0:
+            return False
+
+        start_offset, path = segments[i]
+        await self._open_file(path)
+
+        # Seek directly if the offset is indexed
+        positions = self._log._offset_index.get(self.partition, {}).get(start_offset)
+        rel = self.offset - start_offset
+        if positions is not None:
+            if rel < len(positions):
+                self._pos = positions[rel]
+                return True
+            if rel == len(positions):
+                # Caught up (an idle tail): start right after the last indexed frame
+                if positions:
+                    await self._file.seek(positions[-1])
+                    header = await self._file.read(HEADER_SIZE)
+                    self._pos = positions[-1] + HEADER_SIZE + _FRAME_HDR.unpack(header)[0]
+                return True
+            # Requested offset is past what is currently written
+            await self.close()
+            return False
+
+        # Otherwise skip frames before the requested offset without decoding them
+        await self._file.seek(self._pos)
+        current = start_offset
+        while current < self.offset:
+            header = await self._file.read(HEADER_SIZE)
+            if len(header) < HEADER_SIZE:
+                break
+            length = _FRAME_HDR.unpack(header)[0]
+            await self._file.seek(length, os.SEEK_CUR)
+            self._pos += HEADER_SIZE + length
+            current += 1
+        if current < self.offset:
+            # Requested offset is past what is currently written
+            await self.close()
+            return False
+        return True
+
+    async def _roll_segment(self) -> bool:
+        """Move to the next segment if one starts at our offset."""
+        segments = self._log._segments.get(self.partition, [])
+        i = bisect.bisect_left(segments, self.offset, key=lambda seg: seg[0])
+        if i < len(segments):
+            start_offset, path = segments[i]
+            if start_offset == self.offset and path != self._path:
+                await self.close()
+                await self._open_file(path)
+                return True
+        return False
+
+    async def poll(self) -> AsyncIterator[StreamRecord]:
+        """
+        Yield all complete records available from the current position.
+
+        Reads ahead in large chunks and parses frames from memory, so a scan
+        costs one thread-pool read per chunk rather than two per record.
+        """
+        if self._file is None and not await self._open_segment():
+            return
+
+        while True:
+            await self._file.seek(self._pos)
+            chunk = await self._file.read(_READ_CHUNK)
+            pos = 0
+            while len(chunk) - pos >= HEADER_SIZE:
+                length, stored_crc, codec = _FRAME_HDR.unpack_from(chunk, pos)
+                end = pos + HEADER_SIZE + length
+                if end > len(chunk):
+                    if len(chunk) < _READ_CHUNK:
+                        break # Truncated or partially written
+                    # Frame larger than what is buffered: read the rest of it
+                    chunk = chunk[pos:] + await self._file.read(end - len(chunk))
+                    end -= pos
+                    pos = 0
+                    if end > len(chunk):
+                        break
+
+                payload = chunk[pos + HEADER_SIZE:end]
+                computed_crc = frame_checksum(codec, payload)
+                if computed_crc != stored_crc:
+                    logger.error(f"CRC Mismatch reading {self._path} at offset {self.offset}")
+                    # For safety, we stop without advancing.
+                    return
+
+                try:
+                    record = self._log._decode_record(codec, payload, self.partition, self.offset)
+                except Exception as e:
+                    logger.error(f"Deserialization error: {e}")
+                    return
+
+                self._pos += HEADER_SIZE + length
+                self.offset += 1
+                pos = end
+                yield record
+
+            if pos > 0:
+                continue # Consumed frames; read the next chunk
+            if len(chunk) < HEADER_SIZE:
+                # EOF (or a header still being written): try the next segment
+                if await self._roll_segment():
+                    continue
+            return
+
+    async def close(self) -> None:
+        """Release the underlying file handle."""
+        if self._file is not None:
+            await self._file.close()
+            self._file = None
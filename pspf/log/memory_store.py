@@ -1,4 +1,3 @@
-import asyncio
 from typing import Dict
 from pspf.log.interfaces import OffsetStore
 
@@ -6,22 +5,21 @@ class MemoryOffsetStore(OffsetStore):
     """
     In-memory implementation of OffsetStore.
     Useful for testing and single-instance deployments.
+
+    No lock is needed: neither method awaits, so each runs to completion
+    without interleaving on the event loop.
     """
     def __init__(self) -> None:
         # Mapping: consumer_id -> partition -> offset
         self._offsets: Dict[str, Dict[int, int]] = {}
-        self._lock = asyncio.Lock()
 
     async def get(self, consumer_id: str, partition: int) -> int:
-        async with self._lock:
-            if consumer_id not in self._offsets:
-                return 0
-            return self._offsets[consumer_id].get(partition, 0)
+        offsets = self._offsets.get(consumer_id)
+        if offsets is None:
+            return 0
+        return offsets.get(partition, 0)
 
     async def commit(self, consumer_id: str, partition: int, offset: int) -> None:
-        async with self._lock:
-            if consumer_id not in self._offsets:
-                self._offsets[consumer_id] = {}
-            # Monotonic increase check could be added here, 
-            # but we allow rewinds (setting lower offset) if needed for replay.
-            self._offsets[consumer_id][partition] = offset
+        # Monotonic increase check could be added here, 
+        # but we allow rewinds (setting lower offset) if needed for replay.
+        self._offsets.setdefault(consumer_id, {})[partition] = offset
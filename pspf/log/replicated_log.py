@@ -1,6 +1,7 @@
 import httpx
 import asyncio
-from typing import Optional, List, AsyncIterator, Dict, Any
+import msgpack # type: ignore
+from typing import Optional, List, AsyncIterator, Dict, Any, Set
 from pspf.log.interfaces import Log
 from pspf.log.local_log import LocalLog
 from pspf.models import StreamRecord
@@ -9,6 +10,14 @@ from pspf.utils.logging import get_logger
 
 logger = get_logger("ReplicatedLog")
 
+try:
+    import h2 # type: ignore # noqa: F401
+    HAS_H2 = True
+except ImportError:
+    HAS_H2 = False
+
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
 class ReplicatedLog(Log):
     """
     Wraps a LocalLog and adds synchronous replication logic.
@@ -16,11 +25,19 @@ class ReplicatedLog(Log):
     def __init__(self, local_log: LocalLog, coordinator: ClusterCoordinator, admin_port: int = 8001):
         self._local = local_log
         self._coordinator = coordinator
-        self._http_client = httpx.AsyncClient(timeout=2.0)
+        # Keep connections to followers alive across appends; HTTP/2 multiplexes
+        # fan-out requests when the h2 package is installed and the peer negotiates it.
+        self._http_client = httpx.AsyncClient(
+            http2=HAS_H2,
+            limits=httpx.Limits(max_keepalive_connections=64, max_connections=256),
+            timeout=2.0
+        )
         self._admin_port = admin_port
         self._running = False
         self._sync_task: Optional[asyncio.Task] = None
         self._stop_event = asyncio.Event()
+        # Replication requests still in flight after append returned on quorum
+        self._background: Set[asyncio.Task] = set()
 
     async def start(self) -> None:
         """Start the background sync loop for followers."""
@@ -38,20 +55,33 @@ class ReplicatedLog(Log):
                 await self._sync_task
             except asyncio.CancelledError:
                 pass
+        if self._background:
+            await asyncio.gather(*self._background, return_exceptions=True)
         await self._http_client.aclose()
+        await self._local.close()
         logger.info("ReplicatedLog sync loop stopped.")
 
     async def _sync_loop(self) -> None:
         """Continuously checks leadership and pulls from leader if follower."""
         while self._running:
             try:
-                for p in range(self.partitions()):
-                    is_leader = await self._coordinator.try_acquire_leadership(str(p))
+                partitions = range(self.partitions())
+                # One concurrent pass instead of N sequential round-trips.
+                results = await asyncio.gather(
+                    *(self._coordinator.try_acquire_leadership(str(p)) for p in partitions),
+                    return_exceptions=True,
+                )
+                # Resume offsets for every partition we may pull, in one lookup
+                high_watermarks = await self.get_high_watermarks_all()
+                for p, is_leader in zip(partitions, results):
+                    if isinstance(is_leader, BaseException):
+                        logger.error(f"Leadership check failed for partition {p}: {is_leader}")
+                        continue
                     if not is_leader:
                         # Follower mode: find leader and sync
                         leader_node = await self._coordinator.get_leader_node(str(p))
                         if leader_node:
-                            await self._pull_from_leader(p, leader_node)
+                            await self._pull_from_leader(p, leader_node, high_watermarks[p])
             except Exception as e:
                 logger.error(f"Error in replication sync loop: {e}")
             try:
@@ -59,21 +89,19 @@ class ReplicatedLog(Log):
             except asyncio.TimeoutError:
                 pass # Continue loop
 
-    async def _pull_from_leader(self, partition: int, leader_node: Dict[str, Any]) -> None:
+    async def _pull_from_leader(self, partition: int, leader_node: Dict[str, Any], offset: int) -> None:
+        """Pull records from the leader starting at `offset`, our high watermark."""
         from pspf.models import StreamRecord
         url = f"http://{leader_node['host']}:{leader_node['port']}/internal/pull/{partition}"
         try:
-            # We need to know our high watermark (offset) to resume pulling
-            offset = await self.get_high_watermark(partition)
-            
             resp = await self._http_client.get(f"{url}?offset={offset}")
             resp.raise_for_status()
             
             records = resp.json()
             if records:
-                logger.debug(f"Pulled {len(records)} records from leader {leader_node['id']} for partition {partition}")
+                logger.debug("Pulled %d records from leader %s for partition %s", len(records), leader_node['id'], partition)
             for r_dict in records:
-                r = StreamRecord(**r_dict)
+                r = StreamRecord.from_wire(r_dict)
                 # Append locally (bypass replication check)
                 await self.append_follower(r)
         except Exception as e:
@@ -85,6 +113,9 @@ class ReplicatedLog(Log):
     async def get_high_watermark(self, partition: int) -> int:
         return await self._local.get_high_watermark(partition)
 
+    async def get_high_watermarks_all(self) -> Dict[int, int]:
+        return await self._local.get_high_watermarks_all()
+
     async def read(self, partition: int, offset: int) -> AsyncIterator[StreamRecord]:
         async for r in self._local.read(partition, offset):
             yield r
@@ -101,39 +132,80 @@ class ReplicatedLog(Log):
         if not is_leader:
             raise Exception(f"Not leader for partition {partition}")
 
-        # 2. Write Locally (WAL)
-        await self._local.append(record)
+        # 2. Write Locally (WAL), reusing the partition computed above
+        await self._local.append_with_partition(partition, record)
         
         # 3. Synchronous Replication
         others = await self._coordinator.get_other_nodes()
         if not others:
             return # No one else to replicate to (Single Node Cluster)
 
-        # Broadcast to all others (Fan-out)
-        # In a real system we'd check ACK quorum (N/2 + 1)
-        # Here we just try to send to all, log errors
-        
-        tasks = []
-        for node in others:
-            tasks.append(self._replicate_to_node(node, record))
-            
-        await asyncio.gather(*tasks, return_exceptions=True)
-        # TODO: Handle failures? For now "Best Effort" synchronous replication
+        # Broadcast to all others (Fan-out), returning once a quorum has acked.
+        # Serialize once and share the body across all followers
+        body = msgpack.packb(record.to_wire())
+        await self._replicate(others, "/internal/replicate", body)
+
+    async def append_batch(self, records: List[StreamRecord]) -> None:
+        """
+        Append many records with one local write per partition and one
+        replication request per follower.
+        """
+        if not records:
+            return
+
+        partitions = {self._local._get_partition(r.key) for r in records}
+        for partition in partitions:
+            if not await self._coordinator.try_acquire_leadership(str(partition)):
+                raise Exception(f"Not leader for partition {partition}")
+
+        await self._local.append_batch(records)
 
-    async def _replicate_to_node(self, node: Dict[str, Any], record: StreamRecord) -> None:
-        url = f"http://{node['host']}:{node['port']}/internal/replicate" # Port? Admin port?
+        others = await self._coordinator.get_other_nodes()
+        if not others:
+            return
+
+        body = msgpack.packb([r.to_wire() for r in records])
+        await self._replicate(others, "/internal/replicate_batch", body)
+
+    async def _replicate(self, others: List[Dict[str, Any]], path: str, body: bytes) -> None:
+        """
+        Send a body to every follower and return once a majority of the cluster
+        (this node included) holds it. Slower followers finish in the background.
+        Replication stays best effort: missing the quorum is logged, not raised.
+        """
+        quorum = (len(others) + 1) // 2 + 1
+        acks = 1 # Local write
+        tasks = [asyncio.create_task(self._replicate_to_node(node, path, body)) for node in others]
+        for fut in asyncio.as_completed(tasks):
+            if await fut:
+                acks += 1
+                if acks >= quorum:
+                    break
+
+        for task in tasks:
+            if not task.done():
+                self._background.add(task)
+                task.add_done_callback(self._background.discard)
+
+        if acks < quorum:
+            logger.warning(f"Replication quorum not reached for {path}: {acks}/{quorum} acks")
+
+    async def _replicate_to_node(self, node: Dict[str, Any], path: str, body: bytes) -> bool:
+        url = f"http://{node['host']}:{node['port']}{path}" # Port? Admin port?
         # Coordinator stores registered port. If that's the Admin port, good. 
         # If it's the Prometheus port, bad.
         # We need to ensure nodes register their ADMIN port. 
         # Assuming they register the correct port.
         
         try:
-            # Need to serialize record to JSON compatible dict
-            payload = record.model_dump(mode='json')
-            resp = await self._http_client.post(url, json=payload)
+            resp = await self._http_client.post(
+                url, content=body, headers={"content-type": MSGPACK_CONTENT_TYPE}
+            )
             resp.raise_for_status()
+            return True
         except Exception as e:
             logger.warning(f"Failed to replicate to {node['id']} ({url}): {e}")
+            return False
 
     async def append_follower(self, record: StreamRecord) -> None:
         """
@@ -141,3 +213,9 @@ class ReplicatedLog(Log):
         """
         # Write directly to local log without leadership check
         await self._local.append(record)
+
+    async def append_follower_batch(self, records: List[StreamRecord]) -> None:
+        """
+        Called by the batch replication endpoint.
+        """
+        await self._local.append_batch(records)
@@ -1,16 +1,47 @@
+from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Dict, Optional
-from pydantic import BaseModel, Field
 
-class StreamRecord(BaseModel):
+@dataclass(slots=True, kw_only=True)
+class StreamRecord:
     """
     Internal representation of a record in the Stream Log.
     """
     id: str
     key: str
     value: Dict[str, Any]
-    event_type: str = Field(default="")
+    event_type: str = field(default="")
     timestamp: datetime
     partition: Optional[int] = None
     offset: Optional[int] = None
     topic: Optional[str] = None
+
+    def to_wire(self) -> Dict[str, Any]:
+        """Plain-dict form for replication and the pull API (timestamp as ISO string)."""
+        return {
+            "id": self.id,
+            "key": self.key,
+            "value": self.value,
+            "event_type": self.event_type,
+            "timestamp": self.timestamp.isoformat(),
+            "partition": self.partition,
+            "offset": self.offset,
+            "topic": self.topic,
+        }
+
+    @classmethod
+    def from_wire(cls, data: Dict[str, Any]) -> "StreamRecord":
+        """Inverse of to_wire."""
+        timestamp = data["timestamp"]
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp)
+        return cls(
+            id=data["id"],
+            key=data["key"],
+            value=data["value"],
+            timestamp=timestamp,
+            event_type=data.get("event_type", ""),
+            partition=data.get("partition"),
+            offset=data.get("offset"),
+            topic=data.get("topic"),
+        )
@@ -16,7 +16,7 @@ class StreamBuilder:
 
     def map(self, func: Callable[[Any], Any]) -> "StreamBuilder":
         """Transform each element."""
-        self._ops.append(lambda x: func(x))
+        self._ops.append(func)
         return self
 
     def filter(self, func: Callable[[Any], bool]) -> "StreamBuilder":
@@ -30,6 +30,9 @@ class StreamBuilder:
 
     def sink(self, target_stream: Stream) -> None:
         """Execute the pipeline and send results to another stream."""
+        # Fuse the chain: freeze the ops into a local tuple so each record runs
+        # them in one loop, without re-reading the builder's list.
+        ops = tuple(self._ops)
         
         async def handler(data: Any):
             # Convert to dict for easier manipulation in functional pipeline if needed
@@ -37,7 +40,7 @@ class StreamBuilder:
             if hasattr(current, "model_dump"):
                 current = current.model_dump()
             
-            for op in self._ops:
+            for op in ops:
                 current = op(current)
                 if current is None:
                     return # Filtered out
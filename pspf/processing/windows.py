@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Tuple, Any
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from datetime import datetime, timezone
 
 class Window(ABC):
@@ -11,6 +11,13 @@ class Window(ABC):
         """
         pass
 
+    def assign_windows_batch(self, timestamps: Sequence[float]) -> List[List[Tuple[float, float]]]:
+        """
+        Assigns windows for a batch of timestamps.
+        Returns one list of (start, end) tuples per timestamp, in input order.
+        """
+        return [self.assign_windows(ts) for ts in timestamps]
+
     @property
     def is_session(self) -> bool:
         return False
@@ -21,13 +28,19 @@ class TumblingWindow(Window):
     """
     def __init__(self, size_ms: int):
         self.size_ms = size_ms
+        # Events mostly arrive in time order, so consecutive calls usually
+        # land in the same window: keep its bounds instead of recomputing them
+        self._last: Tuple[Optional[int], Tuple[float, float]] = (None, (0.0, 0.0))
 
     def assign_windows(self, timestamp: float) -> List[Tuple[float, float]]:
         # timestamp is in seconds, convert to ms
         ts_ms = int(timestamp * 1000)
         start = ts_ms - (ts_ms % self.size_ms)
-        end = start + self.size_ms
-        return [(start / 1000.0, end / 1000.0)]
+        last_start, bounds = self._last
+        if start != last_start:
+            bounds = (start / 1000.0, (start + self.size_ms) / 1000.0)
+            self._last = (start, bounds)
+        return [bounds]
 
 class SlidingWindow(Window):
     """
@@ -36,17 +49,54 @@ class SlidingWindow(Window):
     def __init__(self, size_ms: int, slide_ms: int):
         self.size_ms = size_ms
         self.slide_ms = slide_ms
+        # As in TumblingWindow: in-order events mostly repeat the previous
+        # assignment, keyed by (latest window start, window count)
+        self._last: Tuple[Optional[Tuple[int, int]], Tuple[Tuple[float, float], ...]] = (None, ())
 
     def assign_windows(self, timestamp: float) -> List[Tuple[float, float]]:
+        size = self.size_ms
+        slide = self.slide_ms
         ts_ms = int(timestamp * 1000)
-        last_start = ts_ms - (ts_ms % self.slide_ms)
-        windows = []
-        # Backtrack to find all windows that overlap this timestamp
-        current_start = last_start
-        while current_start + self.size_ms > ts_ms:
-             windows.append((current_start / 1000.0, (current_start + self.size_ms) / 1000.0))
-             current_start -= self.slide_ms
-        return windows
+        offset = ts_ms % slide
+        current_start = ts_ms - offset
+        # Windows starting at current_start - k*slide overlap ts while k*slide < size - offset
+        key = (current_start, -((offset - size) // slide))
+        last_key, bounds = self._last
+        if key != last_key:
+            # Backtrack to find all windows that overlap this timestamp (start + size > ts)
+            earliest = ts_ms - size
+            windows = []
+            while current_start > earliest:
+                 windows.append((current_start / 1000.0, (current_start + size) / 1000.0))
+                 current_start -= slide
+            bounds = tuple(windows)
+            self._last = (key, bounds)
+        return list(bounds)
+
+    def assign_windows_batch(self, timestamps: Sequence[float]) -> List[List[Tuple[float, float]]]:
+        """
+        Batch variant of assign_windows.
+        Timestamps with the same slide bucket and window count share one
+        window list, so a batch pays for each distinct assignment once.
+        The returned lists may be shared between entries and must not be mutated.
+        """
+        size = self.size_ms
+        slide = self.slide_ms
+        cache: Dict[Tuple[int, int], List[Tuple[float, float]]] = {}
+        result = []
+        for timestamp in timestamps:
+            ts_ms = int(timestamp * 1000)
+            offset = ts_ms % slide
+            last_start = ts_ms - offset
+            # Windows starting at last_start - k*slide overlap ts while k*slide < size - offset
+            key = (last_start, -((offset - size) // slide))
+            windows = cache.get(key)
+            if windows is None:
+                windows = self.assign_windows(timestamp)
+                cache[key] = windows
+            result.append(windows)
+        return result
+
 class SessionWindow(Window):
     """
     Windows defined by activity gaps.
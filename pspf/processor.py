@@ -1,7 +1,7 @@
 import asyncio
 import signal
 import time
-from typing import Callable, Awaitable, Dict, Any, List, Optional
+from typing import Callable, Awaitable, Dict, Any, List, NamedTuple, Optional, Tuple
 from pspf.utils.logging import get_logger, bind_context, reset_context
 from pspf.connectors.base import StreamingBackend
 from pspf.telemetry import TelemetryManager
@@ -11,8 +11,24 @@ from pspf.state.store import StateStore
 from pspf.context import Context
 import inspect
 
+try:
+    import uvloop # type: ignore
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 logger = get_logger("BatchProcessor")
 
+if settings.USE_UVLOOP and HAS_UVLOOP:
+    # Must happen before the application's asyncio.run() creates its loop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+
+class _StreamMetrics(NamedTuple):
+    ok: Any
+    error: Any
+    dead_letter: Any
+    latency: Any
+
 class BatchProcessor:
     """
     Handles the reliable processing loop for streams.
@@ -28,14 +44,18 @@ class BatchProcessor:
         max_retries (int): Max attempts before moving to DLO.
         min_idle_time_ms (int): Min idle time for message recovery. Default 60000.
         state_store (StateStore): Optional state backend.
+        max_inflight (int): Max messages of a batch processed concurrently.
     """
-    def __init__(self, backend: StreamingBackend, max_retries: int = 3, min_idle_time_ms: int = 60000, state_store: Optional[StateStore] = None, start_admin_server: bool = True):
+    def __init__(self, backend: StreamingBackend, max_retries: int = 3, min_idle_time_ms: int = 60000, state_store: Optional[StateStore] = None, start_admin_server: bool = True, max_inflight: Optional[int] = None):
         """
         Initialize the BatchProcessor.
 
         Args:
             backend (ValkeyStreamBackend): The backend instance.
             max_retries (int): Number of retries before DLO. Default 3.
+            max_inflight (int): Concurrency within a batch. Defaults to settings.MAX_INFLIGHT.
+                                Stateful processing is always sequential, since checkpoints
+                                are ordered by message id.
         """
         self.backend = backend
         self.max_retries = max_retries
@@ -46,10 +66,14 @@ class BatchProcessor:
         self.telemetry = TelemetryManager()
         self.state_store = state_store
         self.tracer = self.telemetry.get_tracer()
+        self._tracing = self.telemetry.enabled
         self._paused = False
         self._start_admin = start_admin_server
         self._shutdown_requested = False
         self._background_tasks = set()
+        self._handler_arity: Dict[Callable, bool] = {}
+        self._bound_metrics: Dict[str, _StreamMetrics] = {}
+        self.max_inflight = max(1, max_inflight if max_inflight is not None else settings.MAX_INFLIGHT)
 
     def pause(self) -> None:
         """Pause message consumption."""
@@ -109,6 +133,7 @@ class BatchProcessor:
             poll_interval (float): Seconds to sleep if no messages found.
         """
         self._running = True
+        self._shutdown_event.clear()
         self._setup_signals()
         
         stream_name = self.backend.stream_key
@@ -128,60 +153,58 @@ class BatchProcessor:
         admin_task = None
         # Start background health/api server
         if self._start_admin:
-            task = asyncio.create_task(self._start_api_server())
-            self._background_tasks.add(task)
-            task.add_done_callback(self._background_tasks.discard)
+            admin_task = asyncio.create_task(self._start_api_server(), name="pspf.admin")
+            self._background_tasks.add(admin_task)
+            admin_task.add_done_callback(self._background_tasks.discard)
         
         # Start Lag Monitor
-        monitor_task = asyncio.create_task(self._monitor_metrics(interval=10.0))
+        monitor_task = asyncio.create_task(self._monitor_metrics(interval=10.0), name="pspf.monitor")
         self._background_tasks.add(monitor_task)
         monitor_task.add_done_callback(self._background_tasks.discard)
         
         # Set Worker Status = 1
         consumer_name = getattr(self.backend, 'consumer_name', 'unknown')
-        self.telemetry.metrics.worker_status.labels(
+        worker_status = self.telemetry.metrics.worker_status.labels(
             stream=stream_name, 
             group=self.backend.group_name,
             consumer=consumer_name
-        ).set(1)
+        )
+        worker_status.set(1)
+
+        # Read of the next batch, issued while the current one is processed
+        next_read: Optional[asyncio.Task] = None
 
         try:
             while self._running:
                 # Check Pause State
                 if self._paused:
                      # Update status to 0 (Paused)
-                     self.telemetry.metrics.worker_status.labels(
-                        stream=stream_name, 
-                        group=self.backend.group_name,
-                        consumer=consumer_name
-                    ).set(0)
-                     await asyncio.sleep(1.0)
+                     worker_status.set(0)
+                     await self._wait_for_shutdown(1.0)
                      continue
                 else:
                      # status 1 (Running)
-                     self.telemetry.metrics.worker_status.labels(
-                        stream=stream_name, 
-                        group=self.backend.group_name,
-                        consumer=consumer_name
-                    ).set(1)
+                     worker_status.set(1)
 
                 try:
-                    # 1. Read Batch
-                    READ_START = time.time()
-                    messages = await self.backend.read_batch(count=batch_size, block_ms=2000)
+                    # 1. Read Batch (or collect the one prefetched last iteration)
+                    if next_read is None:
+                        next_read = asyncio.create_task(self.backend.read_batch(count=batch_size, block_ms=2000))
+                    read, next_read = next_read, None
+                    messages = await read
                     
                     if not messages:
-                        # Check shutdown flag again before sleeping
-                        if not self._running:
+                        # Idle until the next poll, waking immediately on shutdown
+                        if await self._wait_for_shutdown(poll_interval):
                             break
-                        await asyncio.sleep(poll_interval)
                         continue
 
+                    # Prefetch the next batch so backend latency overlaps processing
+                    if self._running and not self._paused:
+                        next_read = asyncio.create_task(self.backend.read_batch(count=batch_size, block_ms=2000))
+
                     # 2. Process Batch
-                    processed_ids = []
-                    for msg_id, data in messages:
-                        if await self._process_single_message(handler, msg_id, data, stream_name):
-                            processed_ids.append(msg_id)
+                    processed_ids = await self._process_batch(handler, messages, stream_name)
 
                     # 3. ACK Batch
                     if processed_ids:
@@ -189,32 +212,40 @@ class BatchProcessor:
 
                 except asyncio.CancelledError:
                     logger.info("Loop cancelled.")
+                    if next_read is not None:
+                        next_read.cancel()
+                        next_read = None
                     break
                 except Exception as e:
                     logger.error(f"Unexpected error in run_loop: {e}")
-                    await asyncio.sleep(1.0) # Backoff
+                    await self._wait_for_shutdown(1.0) # Backoff
+
+            # Finish a batch that was prefetched before the stop; a read still in flight is cancelled
+            if next_read is not None:
+                read, next_read = next_read, None
+                if read.done() and not read.cancelled() and read.exception() is None and read.result():
+                    processed_ids = await self._process_batch(handler, read.result(), stream_name)
+                    if processed_ids:
+                        await self.backend.ack_batch(processed_ids)
+                else:
+                    read.cancel()
         finally:
+            if next_read is not None:
+                next_read.cancel()
             monitor_task.cancel()
             
             # Shutdown Admin Server gracefully if possible
             if self._start_admin:
-                if hasattr(self, "_admin_server"):
-                    self._admin_server.should_exit = True
-                    self._admin_server.force_exit = True
+                if hasattr(self, "_api_server"):
+                    self._api_server.should_exit = True
+                    self._api_server.force_exit = True
                 if admin_task:
                     admin_task.cancel()
             
-            self.telemetry.metrics.worker_status.labels(
-                stream=stream_name, 
-                group=self.backend.group_name,
-                consumer=consumer_name
-            ).set(0)
-            try:
-                await monitor_task
-                if admin_task:
-                    await admin_task
-            except asyncio.CancelledError:
-                pass
+            worker_status.set(0)
+            # Wait for both in parallel so teardown takes the slower of the two, not the sum
+            background = [t for t in (monitor_task, admin_task) if t is not None]
+            await asyncio.gather(*background, return_exceptions=True)
 
         if self.state_store:
             await self.state_store.stop()
@@ -225,6 +256,17 @@ class BatchProcessor:
         self._shutdown_complete.set()
         logger.info("Processor stopped gracefully.")
 
+    async def _wait_for_shutdown(self, timeout: float) -> bool:
+        """
+        Sleep for up to `timeout` seconds, returning early if shutdown is requested.
+        Returns True if shutdown was requested.
+        """
+        try:
+            await asyncio.wait_for(self._shutdown_event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return not self._running
+
     async def _start_api_server(self) -> None:
         """
         Starts the Cluster API server for RPC and Health checks.
@@ -261,38 +303,100 @@ class BatchProcessor:
         """
         Background task to update lag and other metrics.
         """
+        lag_gauge = self.telemetry.metrics.lag.labels(
+            stream=self.backend.stream_key, 
+            group=self.backend.group_name
+        )
         while self._running:
             try:
                 info = await self.backend.get_pending_info()
                 lag = info.get("lag", 0)
                 
-                self.telemetry.metrics.lag.labels(
-                    stream=self.backend.stream_key, 
-                    group=self.backend.group_name
-                ).set(lag)
+                lag_gauge.set(lag)
                 
                 # We could also expose pending count if we added a metric for it
             except Exception as e:
                 logger.warning(f"Error updating metrics: {e}")
             
-            try:
-                await asyncio.wait_for(self._shutdown_event.wait(), timeout=interval)
-            except asyncio.TimeoutError:
-                pass # Continue loop
+            await self._wait_for_shutdown(interval)
 
-    async def _process_single_message(self, handler: Callable, msg_id: str, data: Dict[str, Any], stream_name: str) -> bool:
+    async def _process_batch(self, handler: Callable, messages: List[Tuple[str, Dict[str, Any]]], stream_name: str) -> List[str]:
+        """
+        Process a batch and return the ids that succeeded, in batch order.
+
+        Runs up to max_inflight messages concurrently so I/O-bound handlers overlap.
+        With a state store the batch runs sequentially: the exactly-once check
+        skips any message at or below the last checkpoint, so checkpoints must
+        advance in order.
+        """
+        # Failures are collected so their retry counts are updated in one round trip
+        failures: List[Tuple[str, Dict[str, Any], Exception]] = []
+
+        if self.max_inflight <= 1 or self.state_store or len(messages) <= 1:
+            processed_ids = []
+            for msg_id, data in messages:
+                if await self._process_single_message(handler, msg_id, data, stream_name, failures):
+                    processed_ids.append(msg_id)
+        else:
+            # A fixed pool of workers drains the batch, so only max_inflight tasks
+            # are created per batch rather than one per message.
+            results = [False] * len(messages)
+            pending = iter(enumerate(messages))
+
+            async def worker() -> None:
+                for i, (msg_id, data) in pending:
+                    results[i] = await self._process_single_message(handler, msg_id, data, stream_name, failures)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.max_inflight, len(messages)))))
+            processed_ids = [msg_id for (msg_id, _), ok in zip(messages, results) if ok]
+
+        if failures:
+            await self._handle_processing_errors(failures)
+        return processed_ids
+
+    def _stream_metrics(self, stream_name: str) -> "_StreamMetrics":
+        """Per-stream metric children, bound once so the hot path skips labels() lookups."""
+        bound = self._bound_metrics.get(stream_name)
+        if bound is None:
+            metrics = self.telemetry.metrics
+            bound = _StreamMetrics(
+                ok=metrics.messages_processed.labels(stream=stream_name, status="success"),
+                error=metrics.messages_processed.labels(stream=stream_name, status="error"),
+                dead_letter=metrics.messages_processed.labels(stream=stream_name, status="dead_letter"),
+                latency=metrics.processing_latency.labels(stream=stream_name),
+            )
+            self._bound_metrics[stream_name] = bound
+        return bound
+
+    def _wants_context(self, handler: Callable) -> bool:
+        """Whether the handler takes a Context argument. Cached per handler, as inspect.signature is slow."""
+        wants = self._handler_arity.get(handler)
+        if wants is None:
+            wants = len(inspect.signature(handler).parameters) >= 3
+            self._handler_arity[handler] = wants
+        return wants
+
+    async def _process_single_message(self, handler: Callable, msg_id: str, data: Dict[str, Any], stream_name: str,
+                                      failures: Optional[List[Tuple[str, Dict[str, Any], Exception]]] = None) -> bool:
         """
         Process a single message with context injection, telemetry, and error handling.
         Returns True if successful, False otherwise.
+
+        If `failures` is given, a failed message is appended to it instead of
+        being handled immediately, so the caller can handle a batch of errors at once.
         """
-        PROCESS_START = time.time()
-        ctx = self.telemetry.extract_context(data)
-        
-        with self.tracer.start_as_current_span(
-            "process_message", 
-            context=ctx,
-            attributes={"messaging.message_id": msg_id, "messaging.destination": stream_name}
-        ) as span:
+        process_start = time.monotonic()
+        if self._tracing:
+            span_cm = self.tracer.start_as_current_span(
+                "process_message",
+                context=self.telemetry.extract_context(data),
+                attributes={"messaging.message_id": msg_id, "messaging.destination": stream_name}
+            )
+        else:
+            # Tracing off: skip the no-op tracer's per-message context and attribute setup
+            span_cm = trace.INVALID_SPAN
+
+        with span_cm as span:
             # Bind structured logging context
             log_token = bind_context(
                 stream=stream_name,
@@ -304,44 +408,41 @@ class BatchProcessor:
                 if self.state_store:
                     last_id = await self.state_store.get_checkpoint(stream_name, self.backend.group_name)
                     if last_id and msg_id <= last_id:
-                        logger.debug(f"Skipping already processed message {msg_id} (Checkpoint: {last_id})")
+                        logger.debug("Skipping already processed message %s (Checkpoint: %s)", msg_id, last_id)
                         return True # Count as success so it gets ACKed in Valkey
                 
-                # Invoke handler with Context if requested
-                processing_ctx = Context(state=self.state_store)
-                
-                # Check if handler accepts 3 arguments (msg_id, data, ctx)
-                sig = inspect.signature(handler)
-                
-                async def invoke_handler() -> None:
-                    if len(sig.parameters) >= 3:
-                        await handler(msg_id, data, processing_ctx)
-                    else:
-                        await handler(msg_id, data)
+                # Invoke handler with Context if it accepts 3 arguments (msg_id, data, ctx)
+                if self._wants_context(handler):
+                    args: Tuple[Any, ...] = (msg_id, data, Context(state=self.state_store))
+                else:
+                    args = (msg_id, data)
 
                 if self.state_store:
                     async with self.state_store.transaction():
-                        await invoke_handler()
+                        await handler(*args)
                         # Record checkpoint offset atomically with state changes
                         await self.state_store.checkpoint(stream_name, self.backend.group_name, msg_id)
                 else:
-                    await invoke_handler()
+                    await handler(*args)
 
                 # Metrics
-                duration = time.time() - PROCESS_START
-                self.telemetry.metrics.messages_processed.labels(stream=stream_name, status="success").inc()
-                self.telemetry.metrics.processing_latency.labels(stream=stream_name).observe(duration)
+                duration = time.monotonic() - process_start
+                metrics = self._stream_metrics(stream_name)
+                metrics.ok.inc()
+                metrics.latency.observe(duration)
                 return True
 
             except Exception as e:
-                duration = time.time() - PROCESS_START
-                self.telemetry.metrics.messages_processed.labels(stream=stream_name, status="error").inc()
+                self._stream_metrics(stream_name).error.inc()
                 
                 logger.error(f"Error processing message {msg_id}: {e}")
                 span.record_exception(e)
                 span.set_status(trace.Status(trace.StatusCode.ERROR))
                 
-                await self._handle_processing_error(msg_id, data, e)
+                if failures is not None:
+                    failures.append((msg_id, data, e))
+                else:
+                    await self._handle_processing_error(msg_id, data, e)
                 return False
             finally:
                 reset_context(log_token)
@@ -360,25 +461,50 @@ class BatchProcessor:
         """
         try:
             count = await self.backend.increment_retry_count(msg_id)
-            if count > self.max_retries:
-                logger.error(f"Message {msg_id} exceeded max retries ({self.max_retries}). Moving to DLO.")
-                await self.backend.move_to_dlq(msg_id, data, str(error))
-                self.telemetry.metrics.messages_processed.labels(stream=self.backend.stream_key, status="dead_letter").inc()
-            else:
-                # Calculate exponential backoff with jitter
-                import random
-                base_delay = 1.0 # 1 second
-                # delay = base * 2^count + jitter
-                delay = (base_delay * (2 ** (count - 1))) + (random.random() * 0.5)
-                logger.info(f"Message {msg_id} failed {count}/{self.max_retries} times. Retrying in {delay:.2f}s.")
-                # We don't sleep here as it would block the whole batch. 
-                # In Valkey/Redis XREADGROUP, we just LEAVE it in the PEL.
-                # However, to avoid tight loops on the SAME failing message, 
-                # we could benefit from some local delay if this is the ONLY message.
-                # For now, we rely on the fact that other messages in the stream will be processed first.
+            await self._apply_retry_policy(msg_id, data, error, count)
         except Exception as inner_e:
             logger.critical(f"Failed to handle error for message {msg_id}: {inner_e}")
 
+    async def _handle_processing_errors(self, failures: List[Tuple[str, Dict[str, Any], Exception]]) -> None:
+        """
+        Batch variant of _handle_processing_error.
+        Retry counts for all failed messages are incremented in a single backend call.
+        """
+        if len(failures) == 1:
+            await self._handle_processing_error(*failures[0])
+            return
+
+        try:
+            counts = await self.backend.increment_retry_counts([msg_id for msg_id, _, _ in failures])
+        except Exception as inner_e:
+            logger.critical(f"Failed to handle errors for {len(failures)} messages: {inner_e}")
+            return
+
+        for (msg_id, data, error), count in zip(failures, counts):
+            try:
+                await self._apply_retry_policy(msg_id, data, error, count)
+            except Exception as inner_e:
+                logger.critical(f"Failed to handle error for message {msg_id}: {inner_e}")
+
+    async def _apply_retry_policy(self, msg_id: str, data: Dict[str, Any], error: Exception, count: int) -> None:
+        """Route a failed message to the DLQ once its retry count exceeds max_retries."""
+        if count > self.max_retries:
+            logger.error(f"Message {msg_id} exceeded max retries ({self.max_retries}). Moving to DLO.")
+            await self.backend.move_to_dlq(msg_id, data, str(error))
+            self._stream_metrics(self.backend.stream_key).dead_letter.inc()
+        else:
+            # Calculate exponential backoff with jitter
+            import random
+            base_delay = 1.0 # 1 second
+            # delay = base * 2^count + jitter
+            delay = (base_delay * (2 ** (count - 1))) + (random.random() * 0.5)
+            logger.info(f"Message {msg_id} failed {count}/{self.max_retries} times. Retrying in {delay:.2f}s.")
+            # We don't sleep here as it would block the whole batch. 
+            # In Valkey/Redis XREADGROUP, we just LEAVE it in the PEL.
+            # However, to avoid tight loops on the SAME failing message, 
+            # we could benefit from some local delay if this is the ONLY message.
+            # For now, we rely on the fact that other messages in the stream will be processed first.
+
     async def _recover_stuck_messages(self, handler: Callable[[str, Dict[str, Any]], Awaitable[None]]) -> None:
         """
         Recover messages claimed by crashed workers.
@@ -393,10 +519,7 @@ class BatchProcessor:
             messages = await self.backend.claim_stuck_messages(min_idle_time_ms=self.min_idle_time_ms, count=50)
             if messages:
                 logger.info(f"Recovered {len(messages)} pending messages.")
-                processed_ids = []
-                for msg_id, data in messages:
-                    if await self._process_single_message(handler, msg_id, data, self.backend.stream_key):
-                        processed_ids.append(msg_id)
+                processed_ids = await self._process_batch(handler, messages, self.backend.stream_key)
                 
                 if processed_ids:
                     await self.backend.ack_batch(processed_ids)
@@ -1,6 +1,6 @@
 import uuid
 from datetime import datetime
-from typing import Any, Dict, Optional, Generic, TypeVar, Type
+from typing import Any, Callable, Dict, Optional, Generic, TypeVar, Type
 from pydantic import BaseModel, Field, field_validator
 
 T = TypeVar("T", bound=BaseModel)
@@ -30,10 +30,13 @@ class SchemaRegistry:
     Simple registry to map event types to Pydantic models.
     """
     _registry: Dict[str, Type[BaseModel]] = {}
+    # event_type -> bound model_validate, so validate() does a single lookup per event
+    _validators: Dict[str, Callable[[Any], BaseModel]] = {}
 
     @classmethod
     def register(cls, event_type: str, model: Type[BaseModel]) -> None:
         cls._registry[event_type] = model
+        cls._validators[event_type] = model.model_validate
 
     @classmethod
     def get_model(cls, event_type: str) -> Optional[Type[BaseModel]]:
@@ -50,8 +53,8 @@ class SchemaRegistry:
              # If no event type, try to coerce to BaseEvent generic
              return BaseEvent(**event_dict)
         
-        model_class = cls.get_model(event_type)
-        if model_class:
-            return model_class.model_validate(event_dict)
+        validator = cls._validators.get(event_type)
+        if validator is not None:
+            return validator(event_dict)
         
         return BaseEvent(**event_dict)
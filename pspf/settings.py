@@ -36,6 +36,10 @@ class Settings(BaseSettings):
     DEFAULT_BATCH_SIZE: int = 10
     DEFAULT_POLL_INTERVAL: float = 0.1
     DLO_MAX_RETRIES: int = 3
+    # Messages of one batch processed concurrently (1 = strictly sequential)
+    MAX_INFLIGHT: int = 1
+    # Run on uvloop when it is installed (policy is set when pspf.processor is imported)
+    USE_UVLOOP: bool = False
 
     model_config = SettingsConfigDict(
         env_file=".env", 
@@ -1,3 +1,4 @@
+import time
 from typing import Any, Optional, Dict, AsyncIterator
 from contextlib import asynccontextmanager
 from pspf.state.store import StateStore
@@ -27,19 +28,20 @@ class InMemoryStateStore(StateStore):
 
 
     async def get(self, key: str, default: Any = None) -> Any:
-        import time
-        if key in self._expires and time.time() > self._expires[key]:
-            # Lazy eviction
-            await self.delete(key)
-            return default
+        # Skip the TTL lookup entirely while no key has an expiry
+        if self._expires:
+            expires_at = self._expires.get(key)
+            if expires_at is not None and time.time() > expires_at:
+                # Lazy eviction
+                await self.delete(key)
+                return default
         return self._data.get(key, default)
 
     async def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
-        import time
         self._data[key] = value
         if ttl_seconds is not None:
             self._expires[key] = time.time() + ttl_seconds
-        else:
+        elif self._expires:
             self._expires.pop(key, None)
 
     async def put_batch(self, entries: Dict[str, Any]) -> None:
@@ -2,7 +2,7 @@ import json
 import os
 import asyncio
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, List, Tuple
 from pspf.state.store import StateStore
 from pspf.utils.logging import get_logger
 
@@ -39,6 +39,15 @@ def deserialize_state(data: bytes, key: str, default: Any) -> Any:
         logger.error(f"CORRUPTION DETECTED: Failed to deserialize value for key '{key}': {e}")
         return default
 
+def unwrap_state(obj: Any, now: float) -> Tuple[Any, bool]:
+    """
+    Unwraps a stored {"_v": value, "_exp": expiry} envelope.
+    Returns (value, expired). Values stored without an envelope never expire.
+    """
+    if isinstance(obj, dict) and "_v" in obj and "_exp" in obj:
+        return obj["_v"], obj["_exp"] is not None and now > obj["_exp"]
+    return obj, False
+
 class RocksDBStateStore(StateStore):
     """
     Persistent state store using RocksDB.
@@ -110,10 +119,9 @@ class RocksDBStateStore(StateStore):
                             continue
                             
                         obj = deserialize_state(val, key.decode(errors='ignore'), None)
-                        if isinstance(obj, dict) and "_v" in obj and "_exp" in obj:
-                            if obj["_exp"] is not None and now > obj["_exp"]:
-                                batch.delete(key)
-                                count += 1
+                        if unwrap_state(obj, now)[1]:
+                            batch.delete(key)
+                            count += 1
                                 
                     if count > 0:
                         self._db.write(batch)
@@ -146,16 +154,33 @@ class RocksDBStateStore(StateStore):
         val = await loop.run_in_executor(self._executor, lambda: self._db.get(key.encode()))
         
         if val is not None:
-            obj = deserialize_state(val, key, default)
-            
-            if isinstance(obj, dict) and "_v" in obj and "_exp" in obj:
-                if obj["_exp"] is not None and time.time() > obj["_exp"]:
-                    await self.delete(key) # Lazy eviction
-                    return default
-                return obj["_v"]
-            return obj # Backwards compatibility
+            value, expired = unwrap_state(deserialize_state(val, key, default), time.time())
+            if expired:
+                await self.delete(key) # Lazy eviction
+                return default
+            return value
         return default
 
+    async def get_batch(self, keys: List[str], default: Any = None) -> List[Any]:
+        """Fetch several keys with one multi_get in a single executor hop. Expired entries are left to GC."""
+        import time
+        if not self._db: raise RuntimeError("Store not started")
+
+        encoded = [key.encode() for key in keys]
+        loop = asyncio.get_running_loop()
+        found = await loop.run_in_executor(self._executor, lambda: self._db.multi_get(encoded))
+
+        now = time.time()
+        results: List[Any] = []
+        for key, raw in zip(keys, encoded):
+            val = found.get(raw)
+            if val is None:
+                results.append(default)
+                continue
+            value, expired = unwrap_state(deserialize_state(val, key, default), now)
+            results.append(default if expired else value)
+        return results
+
     async def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         import time
         if not self._db: raise RuntimeError("Store not started")
@@ -1,7 +1,8 @@
+import asyncio
 import aiosqlite
 import json
 import os
-from typing import Any, Optional, Dict, AsyncIterator
+from typing import Any, Optional, Dict, AsyncIterator, List, Tuple
 from contextlib import asynccontextmanager
 from pspf.state.store import StateStore
 from pspf.utils.logging import get_logger
@@ -39,16 +40,36 @@ def deserialize_state(data: bytes, key: str, default: Any) -> Any:
         logger.error(f"CORRUPTION DETECTED: Failed to deserialize value for key '{key}': {e}")
         return default
 
+# Older SQLite builds cap bound parameters per statement at 999
+_MAX_PARAMS = 900
+# put_batch serializes in a worker thread from this many entries
+_OFFLOAD_BATCH = 1000
+
+def _serialize_rows(entries: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+    return [(k, serialize_state(v)) for k, v in entries.items()]
+
 class SQLiteStateStore(StateStore):
     """
     Persistent state store using SQLite.
     Values are stored via msgpack (preferred) or json.
+
+    The database runs in WAL mode. Writes outside a transaction are group-committed:
+    a background task commits at most every `commit_interval_ms`, so a burst of puts
+    shares one commit. Use flush() to force durability, or commit_interval_ms=0 to
+    commit every write immediately. Writes inside transaction() commit with it.
     """
-    def __init__(self, path: str, table_name: str = "kv_store") -> None:
+    def __init__(self, path: str, table_name: str = "kv_store", commit_interval_ms: float = 5.0) -> None:
         self.path = path
         self.table_name = table_name
+        self.commit_interval_ms = commit_interval_ms
+        # Built once so hot calls pass an identical string and hit sqlite3's statement cache
+        self._sql_get = f"SELECT value FROM {table_name} WHERE key = ?"
+        self._sql_put = f"INSERT OR REPLACE INTO {table_name} (key, value) VALUES (?, ?)"
+        self._sql_delete = f"DELETE FROM {table_name} WHERE key = ?"
         self._db: Optional[aiosqlite.Connection] = None
         self._in_transaction = False
+        self._dirty = asyncio.Event()
+        self._commit_task: Optional[asyncio.Task] = None
 
     async def start(self) -> None:
         # Ensure directory exists
@@ -57,6 +78,10 @@ class SQLiteStateStore(StateStore):
             os.makedirs(dirname)
             
         self._db = await aiosqlite.connect(self.path)
+        # WAL lets commits append to the log instead of rewriting pages; NORMAL
+        # syncs at checkpoints rather than on every commit
+        await self._db.execute("PRAGMA journal_mode=WAL")
+        await self._db.execute("PRAGMA synchronous=NORMAL")
         # Main KV table
         await self._db.execute(
             f"CREATE TABLE IF NOT EXISTS {self.table_name} (key TEXT PRIMARY KEY, value BLOB)"
@@ -66,8 +91,32 @@ class SQLiteStateStore(StateStore):
             "CREATE TABLE IF NOT EXISTS pspf_offsets (stream_id TEXT, group_id TEXT, offset TEXT, PRIMARY KEY (stream_id, group_id))"
         )
         await self._db.commit()
+        if self.commit_interval_ms > 0:
+            self._commit_task = asyncio.create_task(self._commit_loop())
         logger.info(f"Opened SQLite State Store at {self.path}")
 
+    async def _commit_loop(self) -> None:
+        """Group commit: one commit for all writes made since the last one."""
+        while True:
+            await self._dirty.wait()
+            await asyncio.sleep(self.commit_interval_ms / 1000.0)
+            self._dirty.clear()
+            # An open transaction() commits these writes itself
+            if self._db and not self._in_transaction:
+                try:
+                    await self._db.commit()
+                except Exception as e:
+                    logger.error(f"Group commit failed: {e}")
+
+    async def _written(self) -> None:
+        """Called after a write: commit now, or leave it to the group commit."""
+        if self._in_transaction or not self._db:
+            return
+        if self._commit_task:
+            self._dirty.set()
+        else:
+            await self._db.commit()
+
     @asynccontextmanager
     async def transaction(self) -> AsyncIterator[None]:
         if not self._db: raise RuntimeError("Store not started")
@@ -78,6 +127,9 @@ class SQLiteStateStore(StateStore):
 
         self._in_transaction = True
         try:
+            # Finish any group-committed writes still pending before opening our own transaction
+            if self._db.in_transaction:
+                await self._db.commit()
             await self._db.execute("BEGIN TRANSACTION")
             yield
             await self._db.commit()
@@ -89,51 +141,67 @@ class SQLiteStateStore(StateStore):
             self._in_transaction = False
 
     async def stop(self) -> None:
+        if self._commit_task:
+            self._commit_task.cancel()
+            try:
+                await self._commit_task
+            except asyncio.CancelledError:
+                pass
+            self._commit_task = None
         if self._db:
+            await self._db.commit()
             await self._db.close()
+            self._db = None
 
     async def get(self, key: str, default: Any = None) -> Any:
         if not self._db: raise RuntimeError("Store not started")
         
-        async with self._db.execute(f"SELECT value FROM {self.table_name} WHERE key = ?", (key,)) as cursor:
+        async with self._db.execute(self._sql_get, (key,)) as cursor:
             row = await cursor.fetchone()
             if row:
                 return deserialize_state(row[0], key, default)
             return default
 
+    async def get_batch(self, keys: List[str], default: Any = None) -> List[Any]:
+        if not self._db: raise RuntimeError("Store not started")
+        
+        found: Dict[str, Any] = {}
+        # Stay under SQLite's bound-parameter limit
+        for i in range(0, len(keys), _MAX_PARAMS):
+            chunk = keys[i:i + _MAX_PARAMS]
+            placeholders = ",".join("?" * len(chunk))
+            async with self._db.execute(
+                f"SELECT key, value FROM {self.table_name} WHERE key IN ({placeholders})", chunk
+            ) as cursor:
+                for key, data in await cursor.fetchall():
+                    found[key] = deserialize_state(data, key, default)
+        return [found.get(key, default) for key in keys]
+
     async def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         if not self._db: raise RuntimeError("Store not started")
         
         data = serialize_state(value)
-        await self._db.execute(
-            f"INSERT OR REPLACE INTO {self.table_name} (key, value) VALUES (?, ?)",
-            (key, data)
-        )
-        if not self._in_transaction:
-            await self._db.commit()
+        await self._db.execute(self._sql_put, (key, data))
+        await self._written()
 
     async def put_batch(self, entries: Dict[str, Any]) -> None:
         if not self._db: raise RuntimeError("Store not started")
         
-        # Prepare data
-        rows = []
-        for k, v in entries.items():
-            rows.append((k, serialize_state(v)))
-            
-        if not rows: return
+        if not entries: return
 
-        await self._db.executemany(
-            f"INSERT OR REPLACE INTO {self.table_name} (key, value) VALUES (?, ?)",
-            rows
-        )
-        if not self._in_transaction:
-            await self._db.commit()
+        # Serialization is CPU-bound; keep large batches off the event loop
+        if len(entries) >= _OFFLOAD_BATCH:
+            rows = await asyncio.to_thread(_serialize_rows, entries)
+        else:
+            rows = _serialize_rows(entries)
+
+        await self._db.executemany(self._sql_put, rows)
+        await self._written()
 
     async def delete(self, key: str) -> None:
         if not self._db: raise RuntimeError("Store not started")
-        await self._db.execute(f"DELETE FROM {self.table_name} WHERE key = ?", (key,))
-        if not self._in_transaction:
-            await self._db.commit()
+        await self._db.execute(self._sql_delete, (key,))
+        await self._written()
 
     async def flush(self) -> None:
         if self._db:
@@ -150,6 +218,7 @@ class SQLiteStateStore(StateStore):
             "INSERT OR REPLACE INTO pspf_offsets (stream_id, group_id, offset) VALUES (?, ?, ?)",
             (stream_id, group_id, offset)
         )
+        # A checkpoint is a durability point: commit now rather than via group commit
         if not self._in_transaction:
             await self._db.commit()
 
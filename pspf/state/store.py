@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Any, Optional, Union, Dict, AsyncIterator
+from typing import Any, Optional, Union, Dict, AsyncIterator, List
 from contextlib import asynccontextmanager
 
 class StateStore(ABC):
@@ -28,6 +28,13 @@ class StateStore(ABC):
         """Retrieve a value by key. Returns default if not found."""
         pass
 
+    async def get_batch(self, keys: List[str], default: Any = None) -> List[Any]:
+        """
+        Retrieve several values, in key order. Missing keys yield default.
+        Stores with a round trip per lookup should override this to fetch in one query.
+        """
+        return [await self.get(key, default) for key in keys]
+
     @abstractmethod
     async def put(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> None:
         """Store a value by key with optional TTL."""
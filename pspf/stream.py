@@ -1,5 +1,7 @@
-from typing import Any, Dict, Optional, Type, Generic, TypeVar, Callable, Awaitable, List
+from typing import Any, Dict, Optional, Type, Generic, TypeVar, Callable, Awaitable, List, cast
 import os
+import time
+from datetime import datetime
 from pspf.connectors.base import StreamingBackend
 from pspf.schema import BaseEvent, SchemaRegistry
 from pspf.processor import BatchProcessor
@@ -232,6 +234,32 @@ class Stream(Generic[T]):
         Returns:
             str: The message ID generated by the backend.
         """
+        data = self._prepare_event(event)
+        target_backend = await self._target_backend(topic)
+        msg_id = await target_backend.add_event(data)
+        return msg_id
+
+    async def emit_batch(self, events: List[Any], topic: Optional[str] = None) -> List[str]:
+        """
+        Produce several events to the stream in one backend call.
+
+        Each event is prepared exactly as in emit(); backends that support it
+        publish the whole batch in a single round trip.
+
+        Args:
+            events (List[Any]): The event objects to publish (BaseModel or dict).
+            topic (Optional[str]): The stream/topic to publish to. Defaults to backend's stream_key.
+
+        Returns:
+            List[str]: The message IDs generated by the backend, in order.
+        """
+        batch = [self._prepare_event(event) for event in events]
+        target_backend = await self._target_backend(topic)
+        return await target_backend.add_events(batch)
+
+    def _prepare_event(self, event: Any) -> Dict[str, Any]:
+        """Serialize an event to a dict carrying its event_type and trace context."""
+        data: Dict[str, Any]
         if hasattr(event, "model_dump"):
             data = event.model_dump(mode='json')
             if "event_type" not in data:
@@ -249,7 +277,10 @@ class Stream(Generic[T]):
         # Inject Trace Context
         # We add a hidden field to carry the trace context
         self.telemetry.inject_context(data)
-            
+        return data
+
+    async def _target_backend(self, topic: Optional[str]) -> StreamingBackend:
+        """Return a connected backend for the given topic (defaults to this stream's)."""
         target_backend = self.backend
         
         # Ensure target backend is connected
@@ -259,9 +290,7 @@ class Stream(Generic[T]):
         if topic and topic != self.backend.stream_key:
             target_backend = self.backend.clone_with_topic(topic)
             await target_backend.connect()
-            
-        msg_id = await target_backend.add_event(data)
-        return msg_id
+        return target_backend
 
     async def run(self, handler: Callable[[T], Awaitable[None]], batch_size: int = 10) -> None:
         """
@@ -277,36 +306,33 @@ class Stream(Generic[T]):
         Raises:
              Exception: Any unhandled exception from the processor or validation logic.
         """
-        async def typed_handler(msg_id: str, raw_data: Dict[str, Any], ctx: Context) -> None:
-            return await self._create_typed_handler(handler, self.backend.stream_key)(msg_id, raw_data, ctx)
+        # Built once: creating it inspects the handler's signature
+        typed_handler = self._create_typed_handler(handler, self.backend.stream_key)
 
         logger.info(f"Starting stream processor for {self.backend.stream_key}...")
         await self.processor.run_loop(typed_handler, batch_size=batch_size)
 
     def _create_typed_handler(self, handler: Callable, topic: str) -> Callable[[str, Dict[str, Any], Context], Awaitable[None]]:
         import inspect
-        sig = inspect.signature(handler)
+        # Resolve everything the per-message path needs up front
+        num_params = len(inspect.signature(handler).parameters)
+        schema = self.schema
+        validate = schema.model_validate if schema else SchemaRegistry.validate
         
         async def typed_handler(msg_id: str, raw_data: Dict[str, Any], ctx: Context) -> None:
             # 1. Deserialize / Validate
-            if self.schema:
-                try:
-                    event = self.schema.model_validate(raw_data)
-                except Exception as e:
+            # Without a schema, dynamic validation goes via the Registry or falls back to BaseEvent
+            # (Valkey decode_responses=True handles bytes->str)
+            try:
+                # cast is needed because validate returns BaseModel but we expect T
+                event = cast(T, validate(raw_data))
+            except Exception as e:
+                if schema:
                     logger.error(f"Schema validation failed for msg {msg_id}: {e}")
-                    # Re-raise so processor handles DLO logic
-                    raise e
-            else:
-                # Dynamic validation via Registry or fallback
-                # Note: raw_data might need cleanup if it has Redis artifacts? 
-                # (Valkey decode_responses=True handles bytes->str)
-                try:
-                    # cast is needed because validate returns BaseModel but we expect T
-                    from typing import cast
-                    event = cast(T, SchemaRegistry.validate(raw_data))
-                except Exception as e:
+                else:
                     logger.error(f"Dynamic validation failed for msg {msg_id}: {e}")
-                    raise e
+                # Re-raise so processor handles DLO logic
+                raise e
                 
             # Inject metadata
             if isinstance(event, BaseEvent):
@@ -314,9 +340,9 @@ class Stream(Generic[T]):
             
             # 2. Call User Logic
             # Pass ctx if the user handler accepts it
-            if len(sig.parameters) >= 3:
+            if num_params >= 3:
                 await handler(msg_id, raw_data, ctx)
-            elif len(sig.parameters) == 2:
+            elif num_params == 2:
                 await handler(msg_id, raw_data)
             else:
                 await handler(event)
@@ -348,19 +374,26 @@ class Stream(Generic[T]):
 
     def _create_aggregation_handler(self, handler: Callable, topic: str, window: Window, watermark_delay_ms: int, backend: StreamingBackend) -> Callable[[str, Dict[str, Any], Context], Awaitable[None]]:
         max_event_ts = 0.0
+        # Bound once: the handler below runs for every event
+        schema = self.schema
+        state_store = self.state_store
+        stream_key = self.backend.stream_key
+        group_name = getattr(backend, "group_name", "default_group")
+        assign_windows = window.assign_windows
+        is_session = window.is_session
+        watermark_delay_s = watermark_delay_ms / 1000.0
 
         async def aggregation_handler(msg_id: str, raw_data: Dict[str, Any], ctx: Context) -> None:
             nonlocal max_event_ts
             # 1. Deserialize / Validate (similar to run_loop)
-            if self.schema:
+            if schema:
                 try:
-                    event = self.schema.model_validate(raw_data)
+                    event = schema.model_validate(raw_data)
                 except Exception as e:
                     logger.error(f"Schema validation failed for msg {msg_id}: {e}")
                     raise e
             else:
                 try:
-                    from typing import cast
                     event = cast(T, SchemaRegistry.validate(raw_data))
                 except Exception as e:
                     logger.error(f"Dynamic validation failed for msg {msg_id}: {e}")
@@ -376,24 +409,21 @@ class Stream(Generic[T]):
             if ts is None:
                 # If no timestamp field, we inject one or fail?
                 # Fallback to current time
-                import time
                 ts_val = time.time()
             else:
-                from datetime import datetime
                 if isinstance(ts, datetime):
                     ts_val = ts.timestamp()
                 elif isinstance(ts, (int, float)):
                     ts_val = float(ts)
                 else:
-                    import time
                     ts_val = time.time()
 
             # 3. Handle Watermarks
             max_event_ts = max(max_event_ts, ts_val)
-            current_watermark = max_event_ts - (watermark_delay_ms / 1000.0)
+            current_watermark = max_event_ts - watermark_delay_s
 
             # 4. Assign Windows
-            windows = window.assign_windows(ts_val)
+            windows = assign_windows(ts_val)
             
             # 5. Process Each Window Location
             # Key extraction: prefer 'key' attribute, else default
@@ -407,16 +437,16 @@ class Stream(Generic[T]):
                     try:
                         late_backend = backend.clone_with_topic(late_topic)
                         await late_backend.add_event(raw_data)
-                        logger.debug(f"Late event {msg_id} routed to DLQ {late_topic}")
+                        logger.debug("Late event %s routed to DLQ %s", msg_id, late_topic)
                     except Exception as e:
                         logger.error(f"Failed to route late event to DLQ: {e}")
                     continue
                 
                 # Dynamic Logic for Sessions vs Fixed Windows
-                if window.is_session:
+                if is_session:
                     # Sessions are tracked by a moving active key
-                    state_key = f"{self.backend.stream_key}:{event_key}:session:active"
-                    current_raw = await self.state_store.get(state_key)
+                    state_key = f"{stream_key}:{event_key}:session:active"
+                    current_raw = await state_store.get(state_key)
                     
                     # session_state structure: {"start": float, "last": float, "agg": Any}
                     if current_raw and isinstance(current_raw, dict) and "last" in current_raw:
@@ -451,18 +481,17 @@ class Stream(Generic[T]):
                         }
                 else:
                     # Fixed Windows (Tumbling/Sliding)
-                    state_key = f"{self.backend.stream_key}:{event_key}:{start}:{end}"
-                    current_state = await self.state_store.get(state_key)
+                    state_key = f"{stream_key}:{event_key}:{start}:{end}"
+                    current_state = await state_store.get(state_key)
                     new_state = await handler(event, current_state) # type: ignore
                 
                 # Save state
-                await self.state_store.put(state_key, new_state)
+                await state_store.put(state_key, new_state)
             
             # Atomically checkpoint offset for exactly-once-ish semantics
             # if the state store supports transactional combined checkpointing.
             # ( SQLiteStateStore does this )
-            group_name = getattr(backend, "group_name", "default_group")
-            await self.state_store.checkpoint(
+            await state_store.checkpoint(
                 stream_id=topic,
                 group_id=group_name,
                 offset=msg_id
@@ -5,7 +5,7 @@ from typing import Dict, Any, Optional
 # Telemetry libraries
 from opentelemetry import trace
 from opentelemetry.sdk.trace import TracerProvider
-from opentelemetry.sdk.trace.export import ConsoleSpanExporter, SimpleSpanProcessor
+from opentelemetry.sdk.trace.export import BatchSpanProcessor, ConsoleSpanExporter
 from opentelemetry.propagate import extract, inject
 from prometheus_client import start_http_server, Counter, Histogram, Gauge
 
@@ -13,6 +13,9 @@ from pspf.settings import settings
 
 logger = logging.getLogger("pspf.telemetry")
 
+# Shared by every caller while tracing is disabled, instead of a provider per call
+_NOOP_TRACER = trace.NoOpTracerProvider().get_tracer("noop")
+
 class MetricsCollector:
     """
     Prometheus Metrics definition.
@@ -92,17 +95,21 @@ class TelemetryManager:
         Configure OTel Provider.
         For production, you'd likely Config OTLP Exporter here.
         For now, we use Console or NoOp.
+
+        Spans are exported in batches from a background thread, so ending a span
+        never blocks the event loop on exporter I/O. Queue size, schedule delay and
+        batch size follow the standard OTEL_BSP_* environment variables.
         """
         provider = TracerProvider()
         # Simple console exporter for demo purposes
-        processor = SimpleSpanProcessor(ConsoleSpanExporter())
+        processor = BatchSpanProcessor(ConsoleSpanExporter())
         provider.add_span_processor(processor)
         trace.set_tracer_provider(provider)
         self.tracer = trace.get_tracer("pspf", "0.1.0")
 
     def get_tracer(self) -> Any:
         if not self.enabled:
-            return trace.NoOpTracerProvider().get_tracer("noop")
+            return _NOOP_TRACER
         return self.tracer
 
     def inject_context(self, carrier: Dict[str, Any]) -> None:
@@ -7,6 +7,11 @@ from pspf.utils.logging import get_logger
 
 logger = get_logger("Topology")
 
+class JoinedEvent(BaseModel):
+    """Default result of Joiner.inner_join."""
+    left: Dict[str, Any]
+    right: Dict[str, Any]
+
 class Router:
     """
     Branching primitive. Evaluates an event against a series of predicates 
@@ -36,11 +41,11 @@ class Router:
         """
         for predicate, target_topic in self.routes:
             if predicate(event):
-                logger.debug(f"Routing event to {target_topic}")
+                logger.debug("Routing event to %s", target_topic)
                 return await self.stream.emit(event, topic=target_topic)
                 
         if self._default_topic:
-            logger.debug(f"Routing event to default topic {self._default_topic}")
+            logger.debug("Routing event to default topic %s", self._default_topic)
             return await self.stream.emit(event, topic=self._default_topic)
             
         return None
@@ -65,13 +70,15 @@ class Joiner:
         Buffers an event from one side of the join into the state store.
         """
         windows = window.assign_windows(timestamp)
+        # Serialize once; overlapping (sliding) windows all buffer the same payload
+        payload = event.model_dump(mode='json')
         for start, end in windows:
             state_key = f"join:{side}:{key}:{start}:{end}"
             
             async with self.state_store.transaction():
                 # Fetch existing buffered events for this window
                 current_buffer = await self.state_store.get(state_key) or []
-                current_buffer.append(event.model_dump(mode='json'))
+                current_buffer.append(payload)
                 
                 await self.state_store.put(state_key, current_buffer)
 
@@ -92,10 +99,6 @@ class Joiner:
         Abstract or customizable method to define how to merge two matching events.
         Defaults to a dict merge.
         """
-        class JoinedEvent(BaseModel):
-            left: Dict[str, Any]
-            right: Dict[str, Any]
-            
         return JoinedEvent(
             left=left_event.model_dump(mode='json'), 
             right=right_event.model_dump(mode='json')
@@ -3,8 +3,15 @@ import sys
 import json
 import datetime
 import os
+import time
 import contextvars
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
+
+try:
+    import orjson # type: ignore
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
 
 # Global context for structured logging
 log_context: contextvars.ContextVar[Dict[str, Any]] = contextvars.ContextVar("log_context", default={})
@@ -26,16 +33,29 @@ def clear_context() -> None:
 class JSONFormatter(logging.Formatter):
     """
     Formatter that outputs JSON strings for structured logging.
+    Uses orjson when installed.
     """
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # (whole second, formatted prefix) of the last record; log bursts share a second
+        self._last_second: Tuple[int, str] = (-1, "")
+
+    def _timestamp(self, created: float) -> str:
+        """UTC ISO-8601 timestamp with milliseconds, taken from the record's creation time."""
+        second = int(created)
+        if second != self._last_second[0]:
+            self._last_second = (second, time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(second)))
+        return "%s.%03dZ" % (self._last_second[1], int((created - second) * 1000))
+
     def format(self, record: logging.LogRecord) -> str:
         log_record: Dict[str, Any] = {
-            "timestamp": datetime.datetime.now(datetime.UTC).isoformat() + "Z",
+            "timestamp": self._timestamp(record.created),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
             "module": record.module,
             "line": record.lineno,
-            "pid": os.getpid(),
+            "pid": record.process if record.process is not None else os.getpid(),
         }
 
         # Include contextual variables
@@ -55,7 +75,9 @@ class JSONFormatter(logging.Formatter):
         if record.stack_info:
             log_record["stack_trace"] = self.formatStack(record.stack_info) # type: ignore
 
-        return json.dumps(log_record)
+        if HAS_ORJSON:
+            return orjson.dumps(log_record, default=str).decode("utf-8")
+        return json.dumps(log_record, default=str)
 
 class ConsoleFormatter(logging.Formatter):
     """
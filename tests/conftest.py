@@ -1,5 +1,12 @@
+import asyncio
 import pytest
 
+try:
+    import uvloop # type: ignore
+    HAS_UVLOOP = True
+except ImportError:
+    HAS_UVLOOP = False
+
 def pytest_addoption(parser):
     parser.addoption(
         "--run-integration", action="store_true", default=False, help="run integration tests"
@@ -16,3 +23,10 @@ def pytest_collection_modifyitems(config, items):
     for item in items:
         if "integration" in item.keywords:
             item.add_marker(skip_integration)
+
+@pytest.fixture(scope="session")
+def event_loop_policy():
+    """Run pytest-asyncio tests on uvloop when it is installed, else the default loop."""
+    if HAS_UVLOOP:
+        return uvloop.EventLoopPolicy()
+    return asyncio.DefaultEventLoopPolicy()
@@ -89,3 +89,11 @@ async def test_kafka_clone_with_topic_preserves_state_store():
     assert cloned.topic == "topic_b"
     assert cloned.state_store == state_store
     assert cloned.retry_tracker_prefix == "pspf:retries:group:topic_b:"
+
+def test_kafka_value_roundtrip_large_ints_and_int_keys():
+    from pspf.connectors.kafka import serialize_value, deserialize_value
+    data = {"big": {"n": 2**70, "neg": -(2**64)}, "ids": [12345678901234567890]}
+    assert deserialize_value(serialize_value(data)) == data
+    # Non-string keys are written as strings, as json does
+    assert deserialize_value(serialize_value({1: "a"})) == {"1": "a"}
+    assert deserialize_value(b'{"n": 1180591620717411303424}') == {"n": 2**70}
@@ -39,6 +39,24 @@ async def test_base_sink_idempotency():
     assert sink.call_count == 2
     assert sink.last_token != token
 
+@pytest.mark.asyncio
+async def test_base_sink_write_batch_idempotency():
+    state_store = InMemoryStateStore()
+    sink = MockApiSink("test_api", state_store)
+
+    event1 = BaseEvent(event_type="TestEvent", payload={"data": "foo"})
+    event2 = BaseEvent(event_type="TestEvent", payload={"data": "bar"})
+    await sink.write(event1)
+    assert sink.call_count == 1
+
+    # event1 already written, event2 repeated within the batch
+    await sink.write_batch([event1, event2, event2])
+    assert sink.call_count == 2
+    assert await state_store.get(sink.generate_token(event2)) is True
+
+    await sink.write_batch([event1, event2])
+    assert sink.call_count == 2
+
 if __name__ == "__main__":
     # Minimal runner if not using pytest
     async def run_manual():
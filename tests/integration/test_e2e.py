@@ -1,6 +1,8 @@
 import asyncio
 import unittest
 import os
+import shutil
+import tempfile
 import uuid
 import time
 from pspf.connectors.valkey import ValkeyConnector, ValkeyStreamBackend
@@ -29,10 +31,9 @@ class TestEndToEnd(unittest.IsolatedAsyncioTestCase):
         self.backend = ValkeyStreamBackend(self.connector, self.stream_key, self.group_name, self.consumer_name)
         await self.backend.ensure_group_exists()
         
-        # Cleanup state
-        if os.path.exists("data/test_state/e2e.db"):
-            os.remove("data/test_state/e2e.db")
-        self.store = SQLiteStateStore("data/test_state/e2e.db")
+        # Per-test state dir, so parallel runs (e.g. pytest -n) never share a database
+        self.state_dir = tempfile.mkdtemp(prefix="pspf-e2e-")
+        self.store = SQLiteStateStore(os.path.join(self.state_dir, "e2e.db"))
         await self.store.start()
 
         self.processor = BatchProcessor(self.backend, state_store=self.store)
@@ -48,8 +49,7 @@ class TestEndToEnd(unittest.IsolatedAsyncioTestCase):
         await client.delete(f"pspf:retries:{self.group_name}:{self.stream_key}")
         
         await self.connector.close()
-        if os.path.exists("data/test_state/e2e.db"):
-            os.remove("data/test_state/e2e.db")
+        shutil.rmtree(self.state_dir, ignore_errors=True)
 
     async def test_full_pipeline(self):
         """
@@ -14,6 +14,19 @@ async def test_stream_auto_instantiation_memory():
     from pspf.connectors.memory import MemoryBackend
     assert isinstance(stream.backend, MemoryBackend)
 
+@pytest.mark.asyncio
+async def test_stream_emit_batch_preserves_order():
+    stream = Stream(topic="test_emit_batch", group="test_group")
+
+    ids = await stream.emit_batch([{"seq": i} for i in range(5)])
+    assert len(ids) == 5
+
+    await stream.backend.ensure_group_exists()
+    messages = await stream.backend.read_batch(count=10, block_ms=10)
+    assert [msg_id for msg_id, _ in messages] == ids
+    assert [data["seq"] for _, data in messages] == list(range(5))
+    assert all(data["event_type"] == "GenericEvent" for _, data in messages)
+
 @pytest.mark.asyncio
 async def test_stream_durable_retry_integration():
     # Use MemoryBackend but with a persistent-style StateStore (Mocked)
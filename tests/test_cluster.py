@@ -9,6 +9,9 @@ class TestClusterCoordinator(unittest.IsolatedAsyncioTestCase):
         self.coordinator = ClusterCoordinator("redis://localhost", "localhost", 8001, "node-1")
         # Inject mock client
         self.coordinator._client = self.mock_redis
+        # Lease scripts are registered on the client and awaited with keys/args
+        self.acquire_script = AsyncMock()
+        self.mock_redis.register_script = MagicMock(return_value=self.acquire_script)
 
     async def test_register(self):
         await self.coordinator._register()
@@ -18,32 +21,46 @@ class TestClusterCoordinator(unittest.IsolatedAsyncioTestCase):
         self.assertIn("node-1", args[1])
 
     async def test_acquire_leadership_success(self):
-        # Setup mock to return True (acquired)
-        self.mock_redis.set.return_value = True
+        # Setup script to return 1 (acquired)
+        self.acquire_script.return_value = 1
         
         result = await self.coordinator.try_acquire_leadership("p0")
         self.assertTrue(result)
         self.assertIn("p0", self.coordinator._held_partitions)
+        self.acquire_script.assert_awaited_once_with(keys=["pspf:partition:p0:leader"], args=["node-1"])
+        self.mock_redis.get.assert_not_called()
 
     async def test_acquire_leadership_failure(self):
-        # Setup mock to return False (not acquired)
-        self.mock_redis.set.return_value = False
-        # Setup get to return someone else
-        self.mock_redis.get.return_value = "node-2"
+        # Setup script to return 0 (owned by someone else)
+        self.acquire_script.return_value = 0
         
         result = await self.coordinator.try_acquire_leadership("p0")
         self.assertFalse(result)
         self.assertNotIn("p0", self.coordinator._held_partitions)
 
     async def test_acquire_leadership_reacquire(self):
-        # Setup mock to return False (already exists)
-        self.mock_redis.set.return_value = False
-        # But WE are the owner
-        self.mock_redis.get.return_value = "node-1"
+        # Setup script to return 2 (already exists, but WE are the owner)
+        self.acquire_script.return_value = 2
         
         result = await self.coordinator.try_acquire_leadership("p0")
         self.assertTrue(result)
         self.assertIn("p0", self.coordinator._held_partitions)
 
+    async def test_renew_leases_pipelined(self):
+        self.coordinator._held_partitions = ["p0", "p1"]
+        script = self.acquire_script
+        pipe = MagicMock()
+        pipe.__aenter__.return_value = pipe
+        pipe.execute = AsyncMock(return_value=[1, 0])
+        self.mock_redis.pipeline = MagicMock(return_value=pipe)
+
+        await self.coordinator._renew_leases()
+
+        # One pipeline round trip renews both leases; the lost one is dropped
+        self.mock_redis.pipeline.assert_called_once_with(transaction=False)
+        self.assertEqual(script.await_count, 2)
+        pipe.execute.assert_awaited_once()
+        self.assertEqual(self.coordinator._held_partitions, ["p0"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -129,5 +129,84 @@ class TestEnterpriseFeatures(unittest.IsolatedAsyncioTestCase):
             await stream.emit(evt)
             self.mock_client.xadd.assert_called()
 
+    async def test_batch_failures_counted_in_one_round_trip(self):
+        """
+        Verify that retry counts for a batch of failures are incremented in
+        a single pipeline, and only messages over the limit go to the DLQ.
+        """
+        self.mock_pipeline.hincrby = MagicMock()
+        self.mock_pipeline.execute = AsyncMock(return_value=[1, 3, 2])
+
+        async def handler(msg_id, data):
+            raise ValueError("downstream unavailable")
+
+        messages = [(f"{i}-0", {"i": str(i)}) for i in range(3)]
+        processed = await self.processor._process_batch(handler, messages, "test-stream")
+
+        self.assertEqual(processed, [])
+        self.mock_client.hincrby.assert_not_called()
+        self.assertEqual(self.mock_pipeline.hincrby.call_count, 3)
+        self.mock_pipeline.execute.assert_awaited_once()
+        # Only 1-0 exceeded max_retries=2
+        self.mock_client.xadd.assert_called_once()
+        self.assertEqual(self.mock_client.xadd.call_args[0][1]["_original_msg_id"], "1-0")
+
+    async def test_batch_processed_concurrently(self):
+        """
+        Verify that max_inflight overlaps handler I/O within a batch and
+        still reports every successful id in batch order.
+        """
+        processor = BatchProcessor(self.backend, max_inflight=4)
+        in_flight = 0
+        peak = 0
+
+        async def handler(msg_id, data):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+
+        messages = [(f"{i}-0", {"i": i}) for i in range(8)]
+        processed = await processor._process_batch(handler, messages, "test-stream")
+
+        self.assertEqual(processed, [m[0] for m in messages])
+        self.assertEqual(peak, 4)
+
+    async def test_next_batch_prefetched_during_processing(self):
+        """
+        Verify that run_loop issues the next read while the current batch
+        is still being processed, and drains a prefetched batch on stop.
+        """
+        batches = [[("1-0", {"i": 1})], [("2-0", {"i": 2})]]
+        events = []
+        backend = MagicMock()
+        backend.stream_key = "test-stream"
+        backend.group_name = "test-group"
+        backend.claim_stuck_messages = AsyncMock(return_value=[])
+        backend.get_pending_info = AsyncMock(return_value={"lag": 0})
+        backend.ack_batch = AsyncMock()
+
+        async def read_batch(count, block_ms):
+            events.append("read")
+            return batches.pop(0) if batches else []
+
+        backend.read_batch = read_batch
+        processor = BatchProcessor(backend, start_admin_server=False)
+
+        async def handler(msg_id, data):
+            events.append(f"start-{msg_id}")
+            await asyncio.sleep(0.01)
+            events.append(f"end-{msg_id}")
+            if msg_id == "1-0":
+                processor._running = False
+
+        await processor.run_loop(handler, poll_interval=0.01)
+
+        self.assertLess(events.index("read", 1), events.index("end-1-0"))
+        self.assertIn("end-2-0", events)
+        acked = [c.args[0] for c in backend.ack_batch.await_args_list]
+        self.assertEqual(acked, [["1-0"], ["2-0"]])
+
 if __name__ == '__main__':
     unittest.main()
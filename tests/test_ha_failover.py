@@ -32,6 +32,18 @@ async def test_coordinator_failover_and_rebalance():
     mock_redis.set.side_effect = mock_set
     mock_redis.get.side_effect = mock_get
     mock_redis.delete.side_effect = mock_delete
+
+    def mock_register_script(script):
+        # Mirrors the lease acquisition script: SET NX, or refresh if already ours
+        async def acquire(keys, args):
+            owner = state.get(keys[0])
+            if owner is None:
+                state[keys[0]] = args[0]
+                return 1
+            return 2 if owner == args[0] else 0
+        return acquire
+
+    mock_redis.register_script = mock_register_script
     
     c1 = ClusterCoordinator("redis://mock", "h1", 8001, "node1")
     c2 = ClusterCoordinator("redis://mock", "h2", 8002, "node2")
@@ -115,5 +115,47 @@ async def test_valkey_x_sqlite(valkey_backend, sqlite_store):
 async def test_valkey_x_memory(valkey_backend, memory_store):
     await run_test_combination(valkey_backend, memory_store)
 
+@pytest.mark.asyncio
+async def test_memory_backend_pending_redelivery():
+    backend = MemoryBackend("s1", "g1")
+    ids = [await backend.add_event({"val": i}) for i in range(3)]
+
+    messages = await backend.read_batch(count=10)
+    assert [m[0] for m in messages] == ids
+    assert (await backend.get_pending_info())["pending"] == 3
+
+    await backend.ack_batch(ids[:2])
+    assert (await backend.get_pending_info())["pending"] == 1
+
+    # Unacked message is redelivered once idle
+    claimed = await backend.claim_stuck_messages(min_idle_time_ms=0)
+    assert claimed == [(ids[2], {"val": 2})]
+
+    # The stored event is a copy of the caller's dict
+    data = {"val": 3}
+    new_id = await backend.add_event(data)
+    data["val"] = 99
+    assert await backend.read_batch(count=10) == [(new_id, {"val": 3})]
+
+@pytest.mark.asyncio
+async def test_memory_backend_pel_per_stream():
+    s1 = MemoryBackend("s1", "g1")
+    s2 = s1.clone_with_topic("s2")
+    # Same counters on both streams, so both hand out the same id
+    for b in (s1, s2):
+        b._last_ts, b._last_seq = 10**15, 0
+    data = {"val": 1}
+    id1 = await s1.add_event(data)
+    id2 = await s2.add_event(data)
+    assert id1 == id2
+
+    await s1.read_batch(count=10)
+    await s2.read_batch(count=10)
+    await s2.ack_batch([id2])
+
+    # The ack on s2 leaves s1's delivery pending and not yet idle
+    assert (await s1.get_pending_info())["pending"] == 1
+    assert await s1.claim_stuck_messages(min_idle_time_ms=60000) == []
+
 # More combinations can be added here for Valkey if a live instance is assumed
 # or for FileBackend.
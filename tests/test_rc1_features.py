@@ -29,11 +29,11 @@ async def test_locallog_crc_corruption_recovery(tmp_path):
     last_path = segments[-1][1]
     
     with open(last_path, "ab") as f:
-        # Header: [Length 4B][CRC 4B (corrupted)]
+        # Header: [Length 4B][CRC 4B (corrupted)][Codec 1B]
         payload = b"corrupted payload"
         length = len(payload)
         bad_crc = 0xDEADBEEF
-        f.write(struct.pack(">II", length, bad_crc) + payload)
+        f.write(struct.pack(">IIB", length, bad_crc, 0) + payload)
         
     # 3. Create a new log instance to trigger recovery
     recovered_log = LocalLog(str(log_dir), num_partitions=1)
@@ -96,6 +96,8 @@ def test_json_logging_format():
     assert "pid" in data
     assert "timestamp" in data
     assert data["level"] == "INFO"
+    assert data["timestamp"] == formatter._timestamp(log_record.created)
+    assert data["timestamp"].endswith("Z") and "+00:00" not in data["timestamp"]
 
 @pytest.mark.asyncio
 async def test_locallog_rotation_enforcement(tmp_path):
@@ -113,3 +115,331 @@ async def test_locallog_rotation_enforcement(tmp_path):
     # Check that we have multiple segments
     segments = log._list_segments(0)
     assert len(segments) > 1
+
+@pytest.mark.asyncio
+async def test_locallog_cursor_tails_across_polls(tmp_path):
+    """
+    Verify that a LogCursor keeps its position between polls and follows
+    new appends and segment rotation.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1, max_segment_size=100)
+    for i in range(3):
+        await log.append(StreamRecord(id=str(i), key="key", value={"x": "y"*10}, timestamp=datetime.now()))
+
+    cursor = log.cursor(0, 1)
+    first = [r.id async for r in cursor.poll()]
+    assert first == ["1", "2"]
+
+    # Nothing new yet
+    assert [r async for r in cursor.poll()] == []
+
+    for i in range(3, 8):
+        await log.append(StreamRecord(id=str(i), key="key", value={"x": "y"*10}, timestamp=datetime.now()))
+
+    second = [r.id async for r in cursor.poll()]
+    assert second == ["3", "4", "5", "6", "7"]
+    assert len(log._list_segments(0)) > 1
+    await cursor.close()
+
+@pytest.mark.asyncio
+async def test_locallog_compressed_roundtrip(tmp_path):
+    """
+    Verify that compressed frames are smaller on disk and survive recovery.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1, compression="zlib")
+    value = {"payload": "abc" * 200}
+    ts = datetime.now()
+    for i in range(3):
+        await log.append(StreamRecord(id=str(i), key="key", value=value, timestamp=ts))
+
+    seg_path = log._list_segments(0)[-1][1]
+    assert seg_path.stat().st_size < 3 * 600
+
+    # Reader does not need to be configured with the same codec
+    reopened = LocalLog(str(tmp_path), num_partitions=1)
+    assert await reopened.get_high_watermark(0) == 3
+    records = [r async for r in reopened.read(0, 0)]
+    assert [r.id for r in records] == ["0", "1", "2"]
+    assert records[0].value == value
+    assert records[0].timestamp == ts
+
+    with pytest.raises(ValueError):
+        LocalLog(str(tmp_path), num_partitions=1, compression="snappy")
+
+@pytest.mark.asyncio
+async def test_locallog_offset_index_seek(tmp_path):
+    """
+    Verify that reads from the middle of a partition use the offset index,
+    both after appends and after recovery rebuilds it.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1, max_segment_size=200)
+    for i in range(10):
+        await log.append(StreamRecord(id=str(i), key="key", value={"x": "y"*10}, timestamp=datetime.now()))
+
+    reopened = LocalLog(str(tmp_path), num_partitions=1, max_segment_size=200)
+    assert reopened._offset_index[0] == log._offset_index[0]
+    assert sum(len(v) for v in reopened._offset_index[0].values()) == 10
+
+    for l in (log, reopened):
+        records = [r.id async for r in l.read(0, 7)]
+        assert records == ["7", "8", "9"]
+
+    await log.close()
+    assert log._writers == {}
+
+@pytest.mark.asyncio
+async def test_locallog_group_commit(tmp_path):
+    """
+    Verify that concurrent appends are coalesced and keep dense offsets.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    records = [StreamRecord(id=str(i), key="key", value={"i": i}, timestamp=datetime.now()) for i in range(20)]
+    await asyncio.gather(*(log.append(r) for r in records))
+
+    assert await log.get_high_watermark(0) == 20
+    assert await log.get_high_watermarks_all() == {0: 20}
+    assert sorted(r.offset for r in records) == list(range(20))
+    read_back = [r async for r in log.read(0, 0)]
+    assert [r.offset for r in read_back] == list(range(20))
+    await log.close()
+
+@pytest.mark.asyncio
+async def test_locallog_sidecar_index_recovery(tmp_path):
+    """
+    Verify that recovery resumes from the .idx sidecar and falls back to a
+    full scan when the sidecar is stale.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    for i in range(5):
+        await log.append(StreamRecord(id=str(i), key="key", value={"i": i}, timestamp=datetime.now()))
+    await log.close()
+
+    seg_path = log._list_segments(0)[-1][1]
+    idx_path = seg_path.with_suffix(".idx")
+    assert idx_path.stat().st_size == 5 * 8
+
+    reopened = LocalLog(str(tmp_path), num_partitions=1)
+    assert await reopened.get_high_watermark(0) == 5
+    assert reopened._offset_index[0] == log._offset_index[0]
+
+    # Sidecar pointing past the data is discarded and rebuilt
+    idx_path.write_bytes(struct.pack(">QQ", 0, 10**9))
+    rebuilt = LocalLog(str(tmp_path), num_partitions=1)
+    assert await rebuilt.get_high_watermark(0) == 5
+    assert idx_path.stat().st_size == 5 * 8
+    assert [r.id async for r in rebuilt.read(0, 3)] == ["3", "4"]
+
+    # A stale sidecar on a segment with no frames is emptied, so appends
+    # do not land after its entries
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+    LocalLog(str(empty_dir), num_partitions=1)
+    stale_idx = empty_dir / "partition_0_0.idx"
+    stale_idx.write_bytes(struct.pack(">QQ", 0, 10**9))
+    log = LocalLog(str(empty_dir), num_partitions=1)
+    assert stale_idx.stat().st_size == 0
+    await log.append(StreamRecord(id="a", key="key", value={}, timestamp=datetime.now()))
+    await log.close()
+    assert LocalLog(str(empty_dir), num_partitions=1)._offset_index[0] == log._offset_index[0]
+
+@pytest.mark.asyncio
+async def test_locallog_readahead_frames_larger_than_chunk(tmp_path, monkeypatch):
+    """
+    Verify that chunked reads still return frames that span chunk boundaries.
+    """
+    import pspf.log.local_log as local_log
+    monkeypatch.setattr(local_log, "_READ_CHUNK", 64)
+
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    for i in range(6):
+        await log.append(StreamRecord(id=str(i), key="key", value={"x": "y" * (i * 40)}, timestamp=datetime.now()))
+
+    records = [r async for r in log.read(0, 0)]
+    assert [len(r.value["x"]) for r in records] == [0, 40, 80, 120, 160, 200]
+
+@pytest.mark.asyncio
+async def test_locallog_migrates_legacy_segments(tmp_path):
+    """
+    Verify that segments written before the format magic are migrated rather
+    than truncated, and that unknown format versions are refused.
+    """
+    import msgpack
+    from pspf.log.local_log import SEGMENT_MAGIC
+
+    def legacy_frame(i):
+        payload = msgpack.packb({
+            "id": str(i), "key": "key", "value": {"i": i}, "event_type": "",
+            "timestamp": datetime(2024, 1, 1, 12, 0, i).isoformat(),
+            "partition": 0, "offset": i,
+        })
+        return struct.pack(">II", len(payload), zlib.crc32(payload) & 0xffffffff) + payload
+
+    seg_path = tmp_path / "partition_0_0.bin"
+    seg_path.write_bytes(legacy_frame(0) + legacy_frame(1))
+
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    assert seg_path.read_bytes().startswith(SEGMENT_MAGIC)
+    assert await log.get_high_watermark(0) == 2
+    await log.append(StreamRecord(id="2", key="key", value={"i": 2}, timestamp=datetime.now()))
+    records = [r async for r in log.read(0, 0)]
+    assert [r.id for r in records] == ["0", "1", "2"]
+    assert records[1].timestamp == datetime(2024, 1, 1, 12, 0, 1)
+    await log.close()
+
+    # A legacy segment with unparseable bytes keeps its original alongside
+    other = tmp_path / "other"
+    other.mkdir()
+    original = legacy_frame(0) + b"\x00\x00\x00\x05garbage"
+    (other / "partition_0_0.bin").write_bytes(original)
+    log = LocalLog(str(other), num_partitions=1)
+    assert await log.get_high_watermark(0) == 1
+    assert (other / "partition_0_0.legacy").read_bytes() == original
+
+    # Segments from a newer format version are left alone
+    newer = tmp_path / "newer"
+    newer.mkdir()
+    (newer / "partition_0_0.bin").write_bytes(SEGMENT_MAGIC[:-1] + b"\x09" + b"x" * 20)
+    with pytest.raises(RuntimeError, match="format version"):
+        LocalLog(str(newer), num_partitions=1)
+    assert (newer / "partition_0_0.bin").stat().st_size == 28
+
+@pytest.mark.asyncio
+async def test_locallog_crc32c_frames_readable_without_package(tmp_path, monkeypatch):
+    """
+    Verify that CRC32C frames still recover and read when google-crc32c is
+    not installed, using the pure-Python fallback.
+    """
+    import pspf.log.local_log as local_log
+    assert local_log.crc32c_py(b"123456789") == 0xE3069283
+
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    log._frame_flags |= local_log.FLAG_CRC32C
+    for i in range(3):
+        await log.append(StreamRecord(id=str(i), key="key", value={"i": i}, timestamp=datetime.now()))
+    await log.close()
+    seg_path = log._list_segments(0)[-1][1]
+    assert seg_path.read_bytes()[local_log.SEGMENT_HEADER_SIZE + 8] & local_log.FLAG_CRC32C
+
+    monkeypatch.setattr(local_log, "HAS_CRC32C", False)
+    reopened = LocalLog(str(tmp_path), num_partitions=1)
+    assert await reopened.get_high_watermark(0) == 3
+    assert [r.id async for r in reopened.read(0, 0)] == ["0", "1", "2"]
+
+@pytest.mark.asyncio
+async def test_locallog_group_commit_cancellation_and_failure(tmp_path):
+    """
+    Verify that cancelling the caller doing a group-commit write still settles
+    the coalesced appends, and that a failed write is rolled back on disk.
+    """
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    rec = lambda i: StreamRecord(id=str(i), key="key", value={"i": i}, timestamp=datetime.now())
+    await log.append(rec(0))
+
+    writer = log._writers[0]
+    real_write = writer.write
+    async def slow_write(data):
+        await asyncio.sleep(0.05)
+        return await real_write(data)
+    writer.write = slow_write
+
+    t1 = asyncio.create_task(log.append(rec(1)))
+    await asyncio.sleep(0.01)
+    t2 = asyncio.create_task(log.append(rec(2)))
+    t3 = asyncio.create_task(log.append(rec(3)))
+    await asyncio.sleep(0.01)
+    t1.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await t1
+    await asyncio.gather(t2, t3)
+    assert await log.get_high_watermark(0) == 4
+    assert [r.id async for r in log.read(0, 0)] == ["0", "1", "2", "3"]
+
+    # A write that fails halfway leaves no trace on disk
+    seg_path = log._list_segments(0)[-1][1]
+    size = seg_path.stat().st_size
+    async def failing_write(data):
+        await real_write(bytes(data)[:5])
+        raise OSError("disk full")
+    writer.write = failing_write
+    with pytest.raises(OSError):
+        await log.append(rec(4))
+    assert seg_path.stat().st_size == size
+    assert await log.get_high_watermark(0) == 4
+
+    await log.append(rec(5))
+    assert [r.id async for r in log.read(0, 3)] == ["3", "5"]
+
+    # After an interrupted write the partition is re-read before appending
+    with open(seg_path, "ab") as f:
+        f.write(b"\x00\x00\x00\x40partial")
+    log._unsynced.add(0)
+    await log.append(rec(6))
+    assert [r.id async for r in log.read(0, 4)] == ["5", "6"]
+    await log.close()
+    reopened = LocalLog(str(tmp_path), num_partitions=1)
+    assert reopened._offset_index[0] == log._offset_index[0]
+
+@pytest.mark.asyncio
+async def test_locallog_timestamps_roundtrip(tmp_path, monkeypatch):
+    """
+    Verify that naive timestamps round-trip regardless of the local timezone
+    (including inside a DST gap) and aware ones keep their UTC offset.
+    """
+    import time
+    from datetime import timedelta, timezone
+    if hasattr(time, "tzset"):
+        monkeypatch.setenv("TZ", "America/New_York")
+        time.tzset()
+    try:
+        stamps = [
+            datetime(2024, 3, 10, 2, 30),  # Does not exist in New York
+            datetime(2024, 11, 3, 1, 30, 0, 123456),  # Ambiguous in New York
+            datetime(2024, 6, 1, 12, tzinfo=timezone(timedelta(hours=5, minutes=30))),
+            datetime(1960, 1, 1, tzinfo=timezone.utc),
+        ]
+        log = LocalLog(str(tmp_path), num_partitions=1)
+        for i, ts in enumerate(stamps):
+            await log.append(StreamRecord(id=str(i), key="key", value={}, timestamp=ts))
+        await log.close()
+
+        reopened = LocalLog(str(tmp_path), num_partitions=1)
+        read_back = [r.timestamp async for r in reopened.read(0, 0)]
+        assert read_back == stamps
+        assert [ts.utcoffset() for ts in read_back] == [ts.utcoffset() for ts in stamps]
+    finally:
+        monkeypatch.delenv("TZ", raising=False)
+        if hasattr(time, "tzset"):
+            time.tzset()
+
+@pytest.mark.asyncio
+async def test_locallog_read_resumes_parked_cursor(tmp_path):
+    """
+    Verify that a read resuming where the previous one stopped reuses its
+    cursor, and that a cursor at the high watermark starts at the end of the
+    last frame without scanning the segment.
+    """
+    from contextlib import aclosing
+    log = LocalLog(str(tmp_path), num_partitions=1)
+    for i in range(5):
+        await log.append(StreamRecord(id=str(i), key="key", value={"i": i}, timestamp=datetime.now()))
+
+    async with aclosing(log.read(0, 0)) as reader:
+        async for r in reader:
+            if r.offset == 2:
+                break
+    parked = log._idle_cursors[(0, 3)]
+    assert [r.id async for r in log.read(0, 3)] == ["3", "4"]
+    assert log._idle_cursors[(0, 5)] is parked
+
+    seg_path = log._list_segments(0)[-1][1]
+    tail = log.cursor(0, 5)
+    assert await tail._open_segment()
+    assert tail._pos == seg_path.stat().st_size
+    assert [r async for r in tail.poll()] == []
+    await log.append(StreamRecord(id="5", key="key", value={}, timestamp=datetime.now()))
+    assert [r.id async for r in tail.poll()] == ["5"]
+    await tail.close()
+
+    assert not await log.cursor(0, 10)._open_segment()
+    await log.close()
+    assert not log._idle_cursors
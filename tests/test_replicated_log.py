@@ -1,4 +1,6 @@
+import asyncio
 import unittest
+import msgpack
 from unittest.mock import MagicMock, AsyncMock, patch
 from datetime import datetime
 from pspf.log.replicated_log import ReplicatedLog
@@ -31,7 +33,7 @@ class TestReplicatedLog(unittest.IsolatedAsyncioTestCase):
         await self.log.append(record)
         
         # Verify Local Write
-        self.mock_local.append.assert_called_once_with(record)
+        self.mock_local.append_with_partition.assert_called_once_with(0, record)
         
         # Verify Replication Call
         self.mock_http.post.assert_called_once()
@@ -48,7 +50,72 @@ class TestReplicatedLog(unittest.IsolatedAsyncioTestCase):
             await self.log.append(record)
         
         self.assertIn("Not leader", str(cm.exception))
-        self.mock_local.append.assert_not_called()
+        self.mock_local.append_with_partition.assert_not_called()
+
+    async def test_append_batch_single_replication_call(self):
+        self.mock_coordinator.try_acquire_leadership.return_value = True
+        self.mock_coordinator.get_other_nodes.return_value = [{"id": "node-2", "host": "h2", "port": 8002}]
+        self.mock_http.post.return_value = MagicMock()
+
+        records = [
+            StreamRecord(id=str(i), key="k1", value={"v": i}, timestamp=datetime.now(), topic="t1")
+            for i in range(5)
+        ]
+        await self.log.append_batch(records)
+
+        self.mock_local.append_batch.assert_called_once_with(records)
+        self.mock_http.post.assert_called_once()
+        call_args = self.mock_http.post.call_args
+        self.assertEqual(call_args[0][0], "http://h2:8002/internal/replicate_batch")
+        self.assertEqual(len(msgpack.unpackb(call_args[1]["content"])), 5)
+
+    async def test_append_returns_on_quorum(self):
+        self.mock_coordinator.try_acquire_leadership.return_value = True
+        self.mock_coordinator.get_other_nodes.return_value = [
+            {"id": f"node-{i}", "host": f"h{i}", "port": 8002} for i in range(2, 5)
+        ]
+        release_slow = asyncio.Event()
+
+        async def post(url, **kwargs):
+            if url.startswith("http://h4"):
+                await release_slow.wait()
+            return MagicMock()
+        self.mock_http.post.side_effect = post
+
+        record = StreamRecord(id="1", key="k1", value={"v": 1}, timestamp=datetime.now(), topic="t1")
+        # Cluster of 4 needs 3 acks: leader + 2 fast followers
+        await asyncio.wait_for(self.log.append(record), timeout=1.0)
+        self.assertEqual(len(self.log._background), 1)
+
+        release_slow.set()
+        await asyncio.gather(*self.log._background)
+        self.assertEqual(len(self.log._background), 0)
+
+    async def test_sync_loop_pulls_from_local_high_watermarks(self):
+        self.mock_local.partitions = MagicMock(return_value=2)
+        self.mock_local.get_high_watermarks_all.return_value = {0: 7, 1: 3}
+        self.mock_coordinator.try_acquire_leadership.return_value = False
+        self.mock_coordinator.get_leader_node.return_value = {"id": "node-2", "host": "h2", "port": 8002}
+
+        async def get(url):
+            if url.endswith("/1?offset=3"):
+                self.log._running = False
+                self.log._stop_event.set()
+            resp = MagicMock()
+            resp.json.return_value = []
+            return resp
+        self.mock_http.get.side_effect = get
+
+        self.log._running = True
+        await asyncio.wait_for(self.log._sync_loop(), timeout=1.0)
+
+        self.mock_local.get_high_watermarks_all.assert_awaited_once()
+        self.mock_local.get_high_watermark.assert_not_called()
+        urls = [c[0][0] for c in self.mock_http.get.call_args_list]
+        self.assertEqual(urls, [
+            "http://h2:8002/internal/pull/0?offset=7",
+            "http://h2:8002/internal/pull/1?offset=3",
+        ])
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,7 +1,7 @@
 import pytest
 import shutil
 import os
-from pspf.state.backends.rocksdb_store import RocksDBStateStore
+from pspf.state.backends.rocksdb_store import RocksDBStateStore, unwrap_state
 
 # Check if rocksdb is installed
 try:
@@ -62,3 +62,28 @@ async def test_rocksdb_checkpoint(tmp_path):
     assert await store.get_checkpoint("stream1", "group2") is None
     
     await store.stop()
+
+def test_unwrap_state():
+    assert unwrap_state({"_v": 1, "_exp": None}, 100.0) == (1, False)
+    assert unwrap_state({"_v": 1, "_exp": 50.0}, 100.0) == (1, True)
+    assert unwrap_state({"_v": 1, "_exp": 150.0}, 100.0) == (1, False)
+    # Values written without the envelope are returned as-is
+    assert unwrap_state({"name": "x"}, 100.0) == ({"name": "x"}, False)
+
+@pytest.mark.skipif(not HAS_ROCKSDB, reason="rocksdb-python not installed")
+@pytest.mark.asyncio
+async def test_rocksdb_get_batch(tmp_path):
+    db_path = str(tmp_path / "rocksdb_get_batch")
+    store = RocksDBStateStore(db_path)
+    await store.start()
+
+    await store.put("live", {"n": 1})
+    await store.put("ttl", 2, ttl_seconds=3600)
+    await store.put("expired", 3, ttl_seconds=-1)
+    await store.put_batch({"bare": 4})
+
+    keys = ["live", "ttl", "expired", "bare", "missing"]
+    assert await store.get_batch(keys, default="d") == [{"n": 1}, 2, "d", 4, "d"]
+    assert await store.get_batch(keys, default="d") == [await store.get(k, "d") for k in keys]
+
+    await store.stop()
@@ -41,6 +41,45 @@ class TestSQLiteStateStore(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(await self.store.get("k2"), "v2")
         self.assertEqual(await self.store.get("k3"), "v3")
 
+    async def test_get_batch(self):
+        await self.store.put_batch({"k1": "v1", "k3": {"n": 3}})
+        
+        vals = await self.store.get_batch(["k1", "k2", "k3", "k1"], "missing")
+        self.assertEqual(vals, ["v1", "missing", {"n": 3}, "v1"])
+        
+        # Larger than a single IN (...) chunk
+        await self.store.put_batch({f"bulk{i}": i for i in range(2000)})
+        vals = await self.store.get_batch([f"bulk{i}" for i in range(2000)])
+        self.assertEqual(vals, list(range(2000)))
+
+    async def test_group_commit(self):
+        import sqlite3
+        
+        def read_from_other_connection(key):
+            conn = sqlite3.connect(self.db_path)
+            try:
+                return conn.execute(
+                    f"SELECT value FROM {self.store.table_name} WHERE key = ?", (key,)
+                ).fetchone()
+            finally:
+                conn.close()
+        
+        for i in range(100):
+            await self.store.put(f"gc{i}", i)
+        # Visible on our own connection straight away
+        self.assertEqual(await self.store.get("gc99"), 99)
+        
+        # Durable for other readers after the background commit
+        await asyncio.sleep(0.05)
+        self.assertIsNotNone(read_from_other_connection("gc99"))
+        
+        # A transaction may start while group-committed writes are still pending
+        await self.store.put("pending", 1)
+        async with self.store.transaction():
+            await self.store.put("in_tx", 2)
+        self.assertIsNotNone(read_from_other_connection("pending"))
+        self.assertIsNotNone(read_from_other_connection("in_tx"))
+
     async def test_complex_types(self):
         data = {"nested": [1, 2, 3], "foo": "bar"}
         await self.store.put("complex", data)
@@ -77,7 +77,9 @@ async def test_valkey_deserialization_logic():
                     "event_type": "Complex",
                     "nested": '{"a": 1}',
                     "list": '[1, 2]',
-                    "simple": "string"
+                    "simple": "string",
+                    "count": "42",
+                    "not_json": "nope"
                 })
             ]
         ]
@@ -90,9 +92,28 @@ async def test_valkey_deserialization_logic():
     msg_id, data = messages[0]
     
     assert data["simple"] == "string"
+    assert data["count"] == 42 # JSON scalars are decoded too
+    assert data["not_json"] == "nope"
     assert data["nested"] == {"a": 1} # Deserialized back to dict
     assert data["list"] == [1, 2]     # Deserialized back to list
 
+@pytest.mark.asyncio
+async def test_file_backend_roundtrip_large_ints_and_dlq(tmp_path):
+    from pspf.connectors.file import FileStreamBackend
+    backend = FileStreamBackend(str(tmp_path / "events.jsonl"))
+    await backend.connect()
+    await backend.add_event({"n": 2**70, "nested": {1: "a"}})
+    assert await backend.read_batch() == [("1", {"n": 2**70, "nested": {"1": "a"}})]
+
+    await backend.move_to_dlq("1", {"n": 2**70}, "boom")
+    dlq = json.loads((tmp_path / "events.jsonl.dlq").read_text())
+    assert dlq == {"n": 2**70, "_error": "boom"}
+
+def test_valkey_fields_roundtrip_large_ints():
+    from pspf.connectors.valkey import _to_fields, _from_fields
+    data = {"big": {"n": 2**70, "neg": -(2**64)}, "ids": [12345678901234567890]}
+    assert _from_fields(_to_fields(data)) == data
+
 # --- Telemetry Tests ---
 def test_telemetry_singleton():
     t1 = TelemetryManager()
@@ -67,13 +67,16 @@ class TestStreamArchitecture(unittest.IsolatedAsyncioTestCase):
                 # to verify value-add logic, but let's try to run the processor for a split second.
                 
                 processed_events = []
+                done = asyncio.Event()
                 async def handler(event):
                     processed_events.append(event)
+                    if len(processed_events) >= 2:
+                        done.set()
                 
-                # We can't easily wait for "one batch" in the infinite loop without expose internals.
-                # Instead, let's cancel the loop after a short delay.
+                # Wait until the handler has seen the batch, then shut down;
+                # shutdown waits for the in-flight batch to be ACKed.
                 task = asyncio.create_task(stream.run(handler, batch_size=2))
-                await asyncio.sleep(0.1)
+                await asyncio.wait_for(done.wait(), timeout=1.0)
                 await stream.processor.shutdown()
                 task.cancel()
                 try:
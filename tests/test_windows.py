@@ -35,5 +35,31 @@ class TestWindows(unittest.TestCase):
         expected = {(5.0, 15.0), (10.0, 20.0)}
         self.assertEqual(set(wins), expected)
 
+    def test_tumbling_window_reuses_bounds_across_calls(self):
+        window = TumblingWindow(size_ms=10000)
+        first = window.assign_windows(12.5)
+        self.assertEqual(window.assign_windows(19.999), first)
+        # Moving to another window (including backwards) recomputes the bounds
+        self.assertEqual(window.assign_windows(20.0), [(20.0, 30.0)])
+        self.assertEqual(window.assign_windows(3.0), [(0.0, 10.0)])
+
+    def test_sliding_window_uneven_slide(self):
+        # Size not a multiple of slide: window count depends on the offset within a slide
+        window = SlidingWindow(size_ms=7000, slide_ms=3000)
+        self.assertEqual(window.assign_windows(9.5), [(9.0, 16.0), (6.0, 13.0), (3.0, 10.0)])
+        self.assertEqual(window.assign_windows(10.5), [(9.0, 16.0), (6.0, 13.0)])
+        # Repeated assignments come from the cache but are still fresh lists
+        wins = window.assign_windows(10.9)
+        wins.clear()
+        self.assertEqual(window.assign_windows(10.9), [(9.0, 16.0), (6.0, 13.0)])
+
+    def test_sliding_window_batch_matches_per_event(self):
+        window = SlidingWindow(size_ms=7000, slide_ms=3000)
+        timestamps = [9.5, 10.5, 9.2, 12.0, 3.0, 10.9]
+        self.assertEqual(
+            window.assign_windows_batch(timestamps),
+            [window.assign_windows(ts) for ts in timestamps]
+        )
+
 if __name__ == '__main__':
     unittest.main()